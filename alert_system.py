@@ -7,11 +7,15 @@ class AlertManager:
     Central alert handling system for VigilDrive AI
     """
 
-    def __init__(self, cooldown_seconds=5):
+    def __init__(self, cooldown_seconds=5, early_warning_seconds=120):
         self.last_alert_time = None
         self.cooldown = timedelta(seconds=cooldown_seconds)
         self.alert_count = 0
 
+        # Warn at MEDIUM while still LOW if the fatigue trend predicts HIGH
+        # within this many seconds
+        self.early_warning_seconds = early_warning_seconds
+
         # Text-to-speech engine (cross-platform)
         self.engine = pyttsx3.init()
         self.engine.setProperty("rate", 165)
@@ -23,10 +27,11 @@ class AlertManager:
         """
         alert_level = detection_result.get("alert_level", "LOW")
         confidence = detection_result.get("confidence", 0.0)
+        trend = detection_result.get("trend") or {}
 
-        self.trigger_alert(alert_level, confidence)
+        self.trigger_alert(alert_level, confidence, trend.get("seconds_to_high"))
 
-    def trigger_alert(self, level: str, confidence: float = 0.0):
+    def trigger_alert(self, level: str, confidence: float = 0.0, seconds_to_high=None):
         now = datetime.now()
 
         # Prevent alert spam
@@ -34,9 +39,12 @@ class AlertManager:
             return
 
         if level == "LOW":
-            return  # no alert
+            if seconds_to_high is None or seconds_to_high > self.early_warning_seconds:
+                return  # no alert
+            self.visual_alert("MEDIUM", confidence,
+                              note=f"fatigue trending up, HIGH expected in ~{seconds_to_high:.0f}s")
 
-        if level == "MEDIUM":
+        elif level == "MEDIUM":
             self.visual_alert(level, confidence)
 
         elif level == "HIGH":
@@ -46,10 +54,11 @@ class AlertManager:
         self.last_alert_time = now
         self.alert_count += 1
 
-    def visual_alert(self, level: str, confidence: float):
+    def visual_alert(self, level: str, confidence: float, note: str = None):
         print(
             f"🚨 ALERT [{level}] | Confidence: {confidence:.2f} | "
             f"Time: {datetime.now().strftime('%H:%M:%S')}"
+            + (f" | {note}" if note else "")
         )
 
     def voice_warning(self):
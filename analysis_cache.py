@@ -0,0 +1,272 @@
+"""
+VigilDrive AI - Analysis Cache
+Content-addressed cache for offline video analysis
+
+Two levels, so a change only redoes the work it invalidates:
+    observations  keyed by (video SHA-256, DETECTOR_VERSION, stride)
+                  -> observation log from a full decode + detection run
+    summaries     keyed by (observation key, thresholds)
+                  -> shift summary, recomputed from the cached observations
+                     by the replay engine when only thresholds change
+"""
+
+import hashlib
+import json
+import os
+
+from observation_log import read_observations
+from replay import DEFAULT_THRESHOLDS, replay_scores, summarize_scores
+
+
+DEFAULT_CACHE_DIR = "analysis_cache"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ClipHashIndex:
+    """Remembers clip hashes by (size, mtime) so unchanged clips are not re-read"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, clip_path):
+        stat = os.stat(clip_path)
+        key = os.path.abspath(clip_path)
+        entry = self.entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+
+        digest = file_sha256(clip_path)
+        self.entries[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+        return digest
+
+    def save(self):
+        _write_json(self.path, self.entries)
+
+
+def thresholds_fingerprint(thresholds):
+    payload = json.dumps(thresholds, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _write_json(path, data):
+    """Atomic write so concurrent workers never see a partial file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _check_stride(stride):
+    if not isinstance(stride, int) or stride < 1:
+        raise ValueError(f"stride must be a positive integer, got {stride!r}")
+
+
+def record_observations(video_path, log_path, on_frame=None, stride=1):
+    """
+    Run the detector over a video, logging observations
+
+    Frames are timestamped with the video's own clock, not the wall clock,
+    so time-based metrics stay correct at any stride. Skipped frames are
+    only grab()bed; retrieve() (decode to BGR) runs just for analysed ones.
+
+    Args:
+        video_path: Input video
+        log_path: Observation log to write
+        on_frame: Optional callable(analysed_count, result) e.g. for previews
+        stride: Analyse every Nth frame
+
+    Returns:
+        dict: {"frames", "analysed_frames", "fps", "stride", "complete"} -
+            complete is False if on_frame stopped the run early
+    """
+    import cv2
+    from detector import DrowsinessDetector
+
+    _check_stride(stride)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    detector = DrowsinessDetector(observation_log=log_path)
+    frame_index = 0
+    analysed = 0
+    complete = True
+
+    try:
+        while cap.grab():
+            if frame_index % stride == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                result = detector.detect_drowsiness(frame, timestamp=frame_index / fps)
+                analysed += 1
+                if on_frame is not None and on_frame(analysed, result) is False:
+                    complete = False
+                    frame_index += 1
+                    break
+            frame_index += 1
+    finally:
+        cap.release()
+        detector.close()
+
+    return {"frames": frame_index, "analysed_frames": analysed, "fps": fps,
+            "stride": stride, "complete": complete}
+
+
+def _decode_seconds(video_path, stride, use_grab):
+    """Time a decode-only pass: read() every frame, or grab() with stride retrieve()s"""
+    import cv2
+    import time
+
+    cap = cv2.VideoCapture(video_path)
+    start = time.perf_counter()
+    frame_index = 0
+    if use_grab:
+        while cap.grab():
+            if frame_index % stride == 0:
+                cap.retrieve()
+            frame_index += 1
+    else:
+        while True:
+            ret, _ = cap.read()
+            if not ret:
+                break
+            frame_index += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return elapsed, frame_index
+
+
+def benchmark_decode(video_path, strides=(1, 2, 3)):
+    """
+    Compare read()-every-frame decoding with grab()/retrieve() at each stride
+
+    Returns:
+        list: One dict per stride with decode and full-analysis timings
+    """
+    import tempfile
+    import time
+
+    read_seconds, frames = _decode_seconds(video_path, 1, use_grab=False)
+    rows = []
+    for stride in strides:
+        grab_seconds, _ = _decode_seconds(video_path, stride, use_grab=True)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            start = time.perf_counter()
+            meta = record_observations(video_path, os.path.join(tmp_dir, "bench.obs"), stride=stride)
+            analysis_seconds = time.perf_counter() - start
+
+        rows.append({
+            "stride": stride,
+            "frames": frames,
+            "analysed_frames": meta["analysed_frames"],
+            "read_ms": round(read_seconds * 1000, 1),
+            "grab_ms": round(grab_seconds * 1000, 1),
+            "decode_speedup": round(read_seconds / grab_seconds, 2) if grab_seconds else 0.0,
+            "analysis_ms": round(analysis_seconds * 1000, 1),
+            "source_fps": round(frames / analysis_seconds, 1) if analysis_seconds else 0.0,
+        })
+    return rows
+
+
+class AnalysisCache:
+    """Cache of per-frame observations and summaries for analysed videos"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hashes = ClipHashIndex(os.path.join(cache_dir, "hashes.json"))
+
+    def _observation_key(self, video_hash, stride):
+        from detector import DETECTOR_VERSION
+        return f"{video_hash}-{DETECTOR_VERSION}-s{stride}"
+
+    def observation_path(self, video_hash, stride=1):
+        key = self._observation_key(video_hash, stride)
+        return os.path.join(self.cache_dir, "observations", video_hash[:2], key + ".obs")
+
+    def summary_path(self, video_hash, thresholds, stride=1):
+        key = f"{self._observation_key(video_hash, stride)}-{thresholds_fingerprint(thresholds)}"
+        return os.path.join(self.cache_dir, "summaries", video_hash[:2], key + ".json")
+
+    def video_hash(self, video_path):
+        digest = self.hashes.get(video_path)
+        self.hashes.save()
+        return digest
+
+    def has_summary(self, video_hash, thresholds=None, stride=1):
+        thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        return os.path.exists(self.summary_path(video_hash, thresholds, stride))
+
+    def analyze(self, video_path, thresholds=None, video_hash=None, on_frame=None, stride=1):
+        """
+        Summarise a video, reusing whatever is already cached
+
+        Args:
+            video_path: Input video
+            thresholds: Overrides for replay.DEFAULT_THRESHOLDS
+            video_hash: Precomputed SHA-256 of the file (hashed here if None)
+            on_frame: Passed to record_observations on a full run
+            stride: Analyse every Nth frame (part of the cache key)
+
+        Returns:
+            dict: Summary (see replay.summarize_scores) plus "fps", "stride",
+                "source_frames", "thresholds" and "cache" ("hit", "rescored", "miss", or
+                "partial" when on_frame stopped the run)
+        """
+        _check_stride(stride)
+        thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        video_hash = video_hash or self.video_hash(video_path)
+
+        summary_path = self.summary_path(video_hash, thresholds, stride)
+        if os.path.exists(summary_path):
+            with open(summary_path, "r", encoding="utf-8") as f:
+                return dict(json.load(f), cache="hit")
+
+        obs_path = self.observation_path(video_hash, stride)
+        meta_path = obs_path[:-4] + ".json"
+
+        if os.path.exists(obs_path) and os.path.exists(meta_path):
+            status = "rescored"
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        else:
+            status = "miss"
+            os.makedirs(os.path.dirname(obs_path), exist_ok=True)
+            tmp = f"{obs_path}.{os.getpid()}.tmp"
+            meta = record_observations(video_path, tmp, on_frame=on_frame, stride=stride)
+
+            if not meta["complete"]:
+                # Interrupted runs are summarised but never cached
+                _, records = read_observations(tmp, mmap=False)
+                os.remove(tmp)
+                summary = summarize_scores(replay_scores(records, thresholds))
+                return dict(summary, fps=meta["fps"], stride=stride, source_frames=meta["frames"],
+                            thresholds=thresholds, cache="partial")
+
+            os.replace(tmp, obs_path)
+            _write_json(meta_path, meta)
+
+        _, records = read_observations(obs_path)
+        summary = summarize_scores(replay_scores(records, thresholds))
+        summary["fps"] = meta["fps"]
+        summary["stride"] = stride
+        summary["source_frames"] = meta["frames"]
+        summary["thresholds"] = thresholds
+        _write_json(summary_path, summary)
+
+        return dict(summary, cache=status)
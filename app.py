@@ -4,18 +4,22 @@ Professional corporate interface for driver monitoring systems
 """
 
 import streamlit as st
-import cv2
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 import time
 
 # Import governance modules
 from governance.privacy import PrivacyManager, AuditLogger
 from governance.model_card import ModelCard
+from detection_store import DetectionStore, run_retention
+from camera_discovery import open_camera
+from capture import GrayCapture, to_display
 
 try:
     from detector import DrowsinessDetector  # noqa
+    from backends import HaarBackend
+    from load_shedding import LoadShedder
     DETECTOR_AVAILABLE = True
 except ImportError:
     DETECTOR_AVAILABLE = False
@@ -487,6 +491,9 @@ if "audit_logger" not in st.session_state:
     st.session_state.audit_logger = AuditLogger()
     st.session_state.audit_logger.log_action("Application started", user="Driver")
 
+if "detection_store" not in st.session_state:
+    st.session_state.detection_store = DetectionStore()
+
 if "model_card" not in st.session_state:
     st.session_state.model_card = ModelCard()
 
@@ -521,6 +528,20 @@ if "critical_alerts" not in st.session_state:
 if "last_session_summary" not in st.session_state:
     st.session_state.last_session_summary = None
 
+if DETECTOR_AVAILABLE and "detector" not in st.session_state:
+    # Cascades are warmed up here, before monitoring starts, not on the first frame
+    st.session_state.detector = DrowsinessDetector(motion_gate=True, cadence=True, presence=True,
+                                                   backend=HaarBackend(warm_up=True))
+
+if DETECTOR_AVAILABLE and "load_shedder" not in st.session_state:
+    _audit_logger = st.session_state.audit_logger
+    st.session_state.load_shedder = LoadShedder(
+        st.session_state.detector,
+        on_transition=lambda e: _audit_logger.log_action(
+            "Load shedding level changed", user="System", details=e
+        ),
+    )
+
 if ALERT_AVAILABLE and "alert_manager" not in st.session_state:
     st.session_state.alert_manager = AlertManager()
 
@@ -651,6 +672,23 @@ if page == "Live Monitor":
                 st.session_state.monitoring_active = False
                 st.session_state.audit_logger.log_action("Monitoring stopped", user="Driver")
 
+                # Compact the detection store between sessions, not during one
+                retention = run_retention(st.session_state.detection_store)
+                st.session_state.audit_logger.log_action(
+                    "Retention run", user="System", details=retention
+                )
+
+                if DETECTOR_AVAILABLE and "capture_stats" in st.session_state:
+                    st.session_state.audit_logger.log_action(
+                        "Camera latency", user="System", details=st.session_state.capture_stats
+                    )
+
+                if DETECTOR_AVAILABLE and st.session_state.detector.presence is not None:
+                    modes = st.session_state.detector.presence.stats()
+                    st.session_state.audit_logger.log_action(
+                        "Detector power modes", user="System", details=modes
+                    )
+
                 # Build a simple session summary for display
                 if st.session_state.session_start_time:
                     duration = int(time.time() - st.session_state.session_start_time)
@@ -671,39 +709,85 @@ if page == "Live Monitor":
 
         if st.session_state.monitoring_active:
             try:
-                cap = cv2.VideoCapture(0)
-
-                if not cap.isOpened():
+                # Cached device/backend from the last run; probes only if gone
+                camera, _ = open_camera()
+                if camera is None:
                     raise RuntimeError("Unable to access camera")
 
+                # The detector only needs luminance, so it gets gray frames
+                # straight from the camera; the simulation shows colour
+                cap = GrayCapture(camera) if DETECTOR_AVAILABLE else camera
+
                 # Continuous loop for live video
                 while st.session_state.monitoring_active:
                     ret, frame = cap.read()
                     if not ret:
                         break
 
-                    # Apply privacy blur
-                    if st.session_state.privacy_manager.blur_enabled:
-                        frame = st.session_state.privacy_manager.blur_faces(frame)
-
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    video_placeholder.image(frame_rgb, channels="RGB", use_container_width=True)
-
-                    # --- Simulated blink / PERCLOS / alert metrics ---
                     now = time.time()
-                    if st.session_state.session_start_time:
-                        session_seconds = max(1, int(now - st.session_state.session_start_time))
-                    else:
-                        session_seconds = 1
-
-                    # Gradual fatigue increase over time (0–80)
-                    base_fatigue = min(80, session_seconds // 10)
-
-                    # Simulate blink rate drifting down slowly as fatigue grows
-                    st.session_state.current_blink_rate = max(4, 20 - session_seconds // 30)
+                    blur_filter = (
+                        st.session_state.privacy_manager.blur_faces
+                        if st.session_state.privacy_manager.blur_enabled
+                        else None
+                    )
 
-                    # Simulate PERCLOS from base_fatigue
-                    st.session_state.current_perclos = min(90.0, base_fatigue * 0.8)
+                    if DETECTOR_AVAILABLE:
+                        # Single face pass per frame: the detector analyses the raw
+                        # pixels and hands its face boxes to the blur stage, which
+                        # only ever touches the display copy. Colour is made only
+                        # for frames the preview will actually show.
+                        preview_colour = (cap.colour() if st.session_state.load_shedder.show_preview()
+                                          else None)
+                        result = st.session_state.detector.detect_drowsiness(
+                            frame, display_filter=blur_filter, timestamp=cap.captured_at,
+                            display_frame=preview_colour,
+                        )
+                        display_frame = result["frame"]
+                        alert_level = result["alert_level"]
+                        st.session_state.current_perclos = result["metrics"]["perclos"] * 100.0
+                        st.session_state.current_blink_rate = result["metrics"]["blink_rate"]
+                    else:
+                        display_frame = blur_filter(frame) if blur_filter else frame
+
+                        # --- Simulated blink / PERCLOS / alert metrics ---
+                        if st.session_state.session_start_time:
+                            session_seconds = max(1, int(now - st.session_state.session_start_time))
+                        else:
+                            session_seconds = 1
+
+                        # Gradual fatigue increase over time (0–80)
+                        base_fatigue = min(80, session_seconds // 10)
+
+                        # Simulate blink rate drifting down slowly as fatigue grows
+                        st.session_state.current_blink_rate = max(4, 20 - session_seconds // 30)
+
+                        # Simulate PERCLOS from base_fatigue
+                        st.session_state.current_perclos = min(90.0, base_fatigue * 0.8)
+
+                        # Decide alert level from PERCLOS + blink rate
+                        if st.session_state.current_perclos > 70 or st.session_state.current_blink_rate < 8:
+                            alert_level = "HIGH"
+                        elif st.session_state.current_perclos > 40 or st.session_state.current_blink_rate < 12:
+                            alert_level = "MEDIUM"
+                        else:
+                            alert_level = "LOW"
+
+                        result = {
+                            "alert_level": alert_level,
+                            "confidence": 0.0,
+                            "metrics": {
+                                "perclos": st.session_state.current_perclos / 100.0,
+                                "blink_rate": st.session_state.current_blink_rate,
+                                "eye_closed_duration": 0.0,
+                                "eyes_detected": 0,
+                                "face_detected": True,
+                            },
+                        }
+                        # --- end simulated metrics ---
+
+                    if not DETECTOR_AVAILABLE or st.session_state.load_shedder.show_preview():
+                        frame_rgb = to_display(display_frame)
+                        video_placeholder.image(frame_rgb, channels="RGB", use_container_width=True)
 
                     # Track maximum PERCLOS seen in this session
                     st.session_state.max_perclos = max(
@@ -711,29 +795,35 @@ if page == "Live Monitor":
                         st.session_state.current_perclos,
                     )
 
-                    # Decide alert level from PERCLOS + blink rate
-                    if st.session_state.current_perclos > 70 or st.session_state.current_blink_rate < 8:
-                        st.session_state.current_alert_level = "CRITICAL"
-                        alert_level = "HIGH"
-                    elif st.session_state.current_perclos > 40 or st.session_state.current_blink_rate < 12:
-                        st.session_state.current_alert_level = "WARNING"
-                        alert_level = "MEDIUM"
-                    else:
-                        st.session_state.current_alert_level = "NORMAL"
-                        alert_level = "LOW"
+                    st.session_state.current_alert_level = {
+                        "HIGH": "CRITICAL",
+                        "MEDIUM": "WARNING",
+                    }.get(alert_level, "NORMAL")
+
+                    st.session_state.detection_store.record(result, ts=now)
 
                     # Trigger alert system if available
                     if ALERT_AVAILABLE and hasattr(st.session_state, 'alert_manager'):
-                        reason = f"PERCLOS: {st.session_state.current_perclos:.1f}%, Blink Rate: {st.session_state.current_blink_rate:.0f} BPM"
-                        st.session_state.alert_manager.trigger_alert(alert_level, reason)
-                    
+                        st.session_state.alert_manager.trigger_alert(
+                            alert_level, result["confidence"],
+                            (result.get("trend") or {}).get("seconds_to_high"),
+                        )
+
                     # Count critical alerts (for summary)
                     if st.session_state.current_alert_level == "CRITICAL":
                         st.session_state.critical_alerts += 1
                         st.session_state.alert_count += 1
                     elif st.session_state.current_alert_level == "WARNING":
                         st.session_state.alert_count += 1
-                    # --- end simulated metrics ---
+
+                    if DETECTOR_AVAILABLE:
+                        # Frames the capture layer had to drain to reach the
+                        # freshest one are the backlog this loop builds up
+                        processing = time.time() - now
+                        cap.frame_age()
+                        st.session_state.capture_stats = cap.stats()
+                        st.session_state.load_shedder.record(processing, cap.last_drained,
+                                                             inference=result["inference"])
 
                     # Small delay so Streamlit can update
                     time.sleep(0.03)
@@ -1132,7 +1222,10 @@ elif page == "Model Card":
     with col4:
         st.metric("F1 Score", f"{metrics['f1_score'] * 100:.1f}%")
 
-    st.info(f"Validated on {metrics['test_dataset_size']:,} simulated driving sessions under controlled conditions")
+    if metrics.get("source") == "evaluation":
+        st.info(f"Evaluated on {metrics['test_dataset_size']:,} labelled clips (run {metrics['evaluated_at']})")
+    else:
+        st.info(f"Validated on {metrics['test_dataset_size']:,} simulated driving sessions under controlled conditions")
 
     st.markdown("<div class='section-header'>Fairness & Bias Testing</div>", unsafe_allow_html=True)
 
@@ -1180,17 +1273,55 @@ elif page == "Audit Log":
     </div>
     """, unsafe_allow_html=True)
 
+    audit_logger = st.session_state.audit_logger
+
+    col_user, col_action, col_dates = st.columns([1, 2, 2])
+    with col_user:
+        user_filter = st.selectbox("User", ["All"] + audit_logger.get_distinct_values("user"))
+    with col_action:
+        action_filter = st.selectbox("Action", ["All"] + audit_logger.get_distinct_values("action"))
+    with col_dates:
+        date_range = st.date_input("Date Range", value=())
+
+    filters = {
+        "user": None if user_filter == "All" else user_filter,
+        "action": None if action_filter == "All" else action_filter,
+        "start": None,
+        "end": None,
+    }
+    if len(date_range) == 2:
+        filters["start"] = datetime.combine(date_range[0], datetime.min.time())
+        filters["end"] = datetime.combine(date_range[1] + timedelta(days=1), datetime.min.time())
+
+    # Cursor stack for the current filter set; reset whenever the filters change
+    if st.session_state.get("audit_filters") != filters:
+        st.session_state.audit_filters = filters
+        st.session_state.audit_cursors = [None]
+
     col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        if st.button("VERIFY INTEGRITY"):
+            report = audit_logger.verify_integrity()
+            if report["valid"]:
+                st.success(f"Hash chain intact: {report['records']:,} entries in {report['segments']} segments")
+            else:
+                st.error("Audit trail integrity check failed: " + "; ".join(report["errors"][:5]))
+    with col2:
+        export_format = st.selectbox("Export Format", ["csv", "jsonl"], label_visibility="collapsed")
     with col3:
         if st.button("EXPORT AUDIT LOG", use_container_width=True):
-            if st.session_state.audit_logger.export_logs("audit_export.csv"):
-                st.success("Audit log successfully exported to audit_export.csv")
+            export_path = f"audit_export.{export_format}"
+            if audit_logger.export_logs(export_path, fmt=export_format, **filters):
+                st.success(f"Audit log successfully exported to {export_path}")
             else:
                 st.error("Export operation failed")
 
     st.markdown("<div class='section-header'>Recent System Events</div>", unsafe_allow_html=True)
 
-    logs = st.session_state.audit_logger.get_recent_logs(50)
+    page_data = audit_logger.get_logs_page(
+        cursor=st.session_state.audit_cursors[-1], limit=50, **filters
+    )
+    logs = page_data["entries"]
 
     if logs:
         log_df = pd.DataFrame(logs)
@@ -1199,6 +1330,18 @@ elif page == "Audit Log":
     else:
         st.info("No audit entries recorded. System actions will appear here.")
 
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("NEWER", disabled=len(st.session_state.audit_cursors) == 1):
+            st.session_state.audit_cursors.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(st.session_state.audit_cursors)}")
+    with col_next:
+        if st.button("OLDER", disabled=page_data["next_cursor"] is None):
+            st.session_state.audit_cursors.append(page_data["next_cursor"])
+            st.rerun()
+
     st.markdown("<div class='section-header'>Audit Trail Capabilities</div>", unsafe_allow_html=True)
 
     col1, col2 = st.columns(2, gap="large")
@@ -0,0 +1,77 @@
+"""
+VigilDrive AI - Aspect Ratios
+Eye and mouth aspect ratios (EAR / MAR) from facial landmark arrays
+
+Each ratio uses six landmarks p1..p6 - two corners (p1, p4), two points on
+the upper contour (p2, p3) and two on the lower one (p6, p5):
+
+    ratio = (|p2 - p6| + |p3 - p5|) / (2 |p1 - p4|)
+
+The kernels take landmarks shaped (N, L, 2) - N frames (or faces from
+several streams) of L landmarks - and return every frame's ratios in one
+NumPy pass. A single frame's (L, 2) array works too, so the live detector
+and offline batches share the same code.
+"""
+
+import numpy as np
+
+
+# MediaPipe Face Mesh indices, ordered p1..p6
+LEFT_EYE = [362, 385, 387, 263, 373, 380]
+RIGHT_EYE = [33, 160, 158, 133, 153, 144]
+MOUTH = [61, 81, 311, 291, 402, 178]  # inner lip contour
+
+EYE_INDICES = np.array([LEFT_EYE, RIGHT_EYE])
+FEATURE_INDICES = np.array([LEFT_EYE, RIGHT_EYE, MOUTH])  # one gather for landmark_ratios
+
+
+def aspect_ratios(landmarks, indices):
+    """
+    Args:
+        landmarks: (N, L, 2) or (L, 2) landmark coordinates
+        indices: Six landmark indices, or (K, 6) for K features at once
+
+    Returns:
+        np.ndarray: Ratios shaped (N,), (N, K), or without the N axis for a
+            single (L, 2) frame; 0 where the corners coincide
+    """
+    points = np.asarray(landmarks, dtype=np.float32)
+    single = points.ndim == 2
+    if single:
+        points = points[None]
+
+    p = points[:, np.asarray(indices)]  # (N, [K,] 6, 2)
+    vertical = (np.linalg.norm(p[..., 1, :] - p[..., 5, :], axis=-1)
+                + np.linalg.norm(p[..., 2, :] - p[..., 4, :], axis=-1))
+    horizontal = np.linalg.norm(p[..., 0, :] - p[..., 3, :], axis=-1)
+
+    ratios = np.zeros_like(horizontal)
+    np.divide(vertical, 2.0 * horizontal, out=ratios, where=horizontal > 0)
+    return ratios[0] if single else ratios
+
+
+def eye_aspect_ratios(landmarks):
+    """Per-eye EAR shaped (N, 2) - left, right - or (2,) for one frame"""
+    return aspect_ratios(landmarks, EYE_INDICES)
+
+
+def mouth_aspect_ratio(landmarks):
+    """MAR shaped (N,), or a scalar array for one frame"""
+    return aspect_ratios(landmarks, MOUTH)
+
+
+def landmark_ratios(landmarks):
+    """
+    Everything the detector derives from landmarks, in one pass over both
+    eyes and the mouth
+
+    Returns:
+        dict: "ear_left", "ear_right", "ear" (mean of both eyes) and "mar"
+    """
+    ratios = aspect_ratios(landmarks, FEATURE_INDICES)
+    return {
+        "ear_left": ratios[..., 0],
+        "ear_right": ratios[..., 1],
+        "ear": ratios[..., :2].mean(axis=-1),
+        "mar": ratios[..., 2],
+    }
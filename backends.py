@@ -0,0 +1,278 @@
+"""
+VigilDrive AI - Detector Backends
+Interchangeable face / eye-state engines behind DrowsinessDetector
+
+Every backend works on grayscale frames and answers two questions:
+
+    locate_faces(gray, scale)   -> face boxes (x, y, w, h) in frame coordinates
+    eye_state(gray, face_box)   -> {"eyes": open-eye boxes relative to the eye
+                                    band (top 60% of the face box),
+                                    "ear": eye aspect ratio or None,
+                                    "mar": mouth aspect ratio or None}
+
+Closure is always "fewer than two open eyes", so metrics, alert levels,
+observation logs and replay behave identically whichever backend runs.
+
+    haar       OpenCV Haar cascades (default, no extra dependencies)
+    mediapipe  MediaPipe Face Mesh landmarks; an eye counts as open while its
+               eye aspect ratio (EAR) is above ear_threshold
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from aspect_ratios import EYE_INDICES, landmark_ratios
+from cascades import EYE_CASCADE, FACE_CASCADE, get_cascade
+
+
+EYE_BAND = 0.6  # share of the face box height searched for eyes
+
+
+class HaarBackend:
+    """Face and eye Haar cascades; an eye is open if the cascade finds it"""
+
+    name = "haar"
+
+    def __init__(self, warm_up=False):
+        """
+        Args:
+            warm_up: Run both cascades once on a blank frame so the first
+                real frame is not slow (once per process)
+        """
+        # Shared per process: further detectors do not parse the XML again
+        self.face_cascade = get_cascade(FACE_CASCADE, warm_up)
+        self.eye_cascade = get_cascade(EYE_CASCADE, warm_up)
+
+    def locate_faces(self, gray, scale=1.0):
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        min_side = int(100 * scale)
+        faces = self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.1,
+            minNeighbors=5,
+            minSize=(min_side, min_side)
+        )
+        return [tuple(int(v / scale) for v in f) for f in faces]
+
+    def eye_state(self, gray, face_box):
+        x, y, w, h = face_box
+        eyes = self.eye_cascade.detectMultiScale(
+            gray[y:y+int(h*EYE_BAND), x:x+w],
+            scaleFactor=1.1,
+            minNeighbors=10,
+            minSize=(20, 20)
+        )
+        return {"eyes": [tuple(int(v) for v in e) for e in eyes], "ear": None, "mar": None}
+
+    def close(self):
+        pass
+
+
+class FaceMeshBackend:
+    """MediaPipe Face Mesh landmarks with an eye aspect ratio test per eye"""
+
+    name = "mediapipe"
+
+    def __init__(self, ear_threshold=0.21, max_faces=1):
+        """
+        Args:
+            ear_threshold: EAR below which an eye counts as closed
+            max_faces: Faces tracked per frame
+        """
+        try:
+            import mediapipe as mp
+        except ImportError as e:
+            raise ImportError("The mediapipe backend needs the mediapipe package "
+                              "(see requirements.txt)") from e
+
+        self.ear_threshold = ear_threshold
+        self._mesh = mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=False,
+            max_num_faces=max_faces,
+            refine_landmarks=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+        )
+        # Crops of reused face boxes go to a separate, untracked instance so
+        # they do not disturb full-frame tracking
+        self._crop_mesh = mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=True,
+            max_num_faces=1,
+            refine_landmarks=False,
+            min_detection_confidence=0.5,
+        )
+        self._gray = None
+        self._landmarks = []
+
+    def _run_mesh(self, gray, offset=(0, 0), mesh=None):
+        """Landmark arrays (468, 2) in frame pixels for each face in gray"""
+        h, w = gray.shape[:2]
+        result = (mesh or self._mesh).process(cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB))
+        meshes = []
+        scale = np.array([w, h], dtype=np.float32)
+        shift = np.asarray(offset, dtype=np.float32)
+        for face in result.multi_face_landmarks or []:
+            points = np.array([(p.x, p.y) for p in face.landmark], dtype=np.float32)
+            meshes.append(points * scale + shift)
+        return meshes
+
+    def locate_faces(self, gray, scale=1.0):
+        small = gray
+        if scale < 1.0:
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        meshes = [m / scale for m in self._run_mesh(small)]
+
+        # Keep the landmarks for eye_state on this same frame
+        self._gray = gray
+        self._landmarks = meshes
+
+        faces = []
+        for points in meshes:
+            x0, y0 = points.min(axis=0)
+            x1, y1 = points.max(axis=0)
+            faces.append((int(x0), int(y0), int(x1 - x0), int(y1 - y0)))
+        return faces
+
+    def _landmarks_for(self, gray, face_box):
+        x, y, w, h = face_box
+        if self._gray is gray:
+            for points in self._landmarks:
+                cx, cy = points.mean(axis=0)
+                if x <= cx <= x + w and y <= cy <= y + h:
+                    return points
+
+        # Face box was reused from an earlier frame: mesh just its padded crop
+        pad_x, pad_y = w // 4, h // 4
+        x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+        crop = gray[y0:y + h + pad_y, x0:x + w + pad_x]
+        meshes = self._run_mesh(crop, offset=(x0, y0), mesh=self._crop_mesh)
+        return meshes[0] if meshes else None
+
+    def eye_state(self, gray, face_box):
+        points = self._landmarks_for(gray, face_box)
+        if points is None:
+            return {"eyes": [], "ear": None, "mar": None}
+
+        ratios = landmark_ratios(points)
+        x, y = face_box[:2]
+        eyes = []
+        for indices, ear in zip(EYE_INDICES, (ratios["ear_left"], ratios["ear_right"])):
+            if ear >= self.ear_threshold:
+                eye = points[indices]
+                ex0, ey0 = eye.min(axis=0)
+                ex1, ey1 = eye.max(axis=0)
+                eyes.append((int(ex0) - x, int(ey0) - y, int(ex1 - ex0), int(ey1 - ey0)))
+        return {"eyes": eyes, "ear": round(float(ratios["ear"]), 3), "mar": round(float(ratios["mar"]), 3)}
+
+    def close(self):
+        self._mesh.close()
+        self._crop_mesh.close()
+
+
+BACKENDS = {
+    HaarBackend.name: HaarBackend,
+    FaceMeshBackend.name: FaceMeshBackend,
+}
+
+
+def register_backend(name, factory):
+    """Make a backend available to DrowsinessDetector(backend=name)"""
+    BACKENDS[name] = factory
+
+
+def create_backend(name="haar", **kwargs):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown detector backend '{name}' (available: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
+
+
+def available_backends():
+    """Registered backends whose dependencies can be loaded here"""
+    names = []
+    for name, factory in BACKENDS.items():
+        try:
+            factory().close()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _load_labels(closed_labels):
+    """Per-frame closure labels from a sequence or a file of 0/1 values"""
+    if closed_labels is None or not isinstance(closed_labels, str):
+        return closed_labels
+    with open(closed_labels, "r", encoding="utf-8") as f:
+        return [int(v) for v in f.read().replace(",", " ").split()]
+
+
+def benchmark_backends(video_path, backends=None, closed_labels=None, max_frames=None):
+    """
+    Run each backend over the same video and compare cost and closure calls
+
+    Args:
+        video_path: Clip to analyse
+        backends: Names to compare (defaults to every available backend)
+        closed_labels: Optional per-frame ground truth (1 = eyes closed), as a
+            sequence or a whitespace/comma separated file. Without it, accuracy
+            is agreement with the first backend.
+        max_frames: Stop after this many frames
+
+    Returns:
+        list: One dict per backend with cpu_ms_per_frame, fps, face_rate and
+            closure_accuracy
+    """
+    from detector import DrowsinessDetector
+
+    names = backends or available_backends()
+    labels = _load_labels(closed_labels)
+    rows = []
+    reference = None
+
+    for name in names:
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Cannot open video: {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        detector = DrowsinessDetector(backend=name)
+        detector.draw_overlay = False
+
+        calls = []
+        frame_index = 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        while max_frames is None or frame_index < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            result = detector.detect_drowsiness(frame, timestamp=frame_index / fps)
+            metrics = result["metrics"]
+            calls.append(int(metrics["eyes_detected"] < 2) if metrics["face_detected"] else None)
+            frame_index += 1
+        cpu_seconds = time.process_time() - cpu_start
+        wall_seconds = time.perf_counter() - wall_start
+        cap.release()
+        detector.close()
+
+        truth = labels if labels is not None else reference
+        if truth is None:
+            accuracy = None
+        else:
+            pairs = [(c, t) for c, t in zip(calls, truth) if c is not None and t is not None]
+            accuracy = round(sum(c == t for c, t in pairs) / len(pairs), 3) if pairs else None
+        if reference is None:
+            reference = calls
+
+        rows.append({
+            "backend": name,
+            "frames": frame_index,
+            "cpu_ms_per_frame": round(cpu_seconds * 1000 / frame_index, 2) if frame_index else 0.0,
+            "fps": round(frame_index / wall_seconds, 1) if wall_seconds else 0.0,
+            "face_rate": round(sum(c is not None for c in calls) / frame_index, 3) if frame_index else 0.0,
+            "closure_accuracy": accuracy,
+            "accuracy_basis": "labels" if labels is not None else f"agreement with {names[0]}",
+        })
+    return rows
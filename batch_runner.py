@@ -0,0 +1,201 @@
+"""
+VigilDrive AI - Batch Runner
+Analyses a directory of fleet footage on a process pool
+
+Progress is journalled to <output>/manifest.jsonl as each file finishes, so a
+crashed or interrupted run picks up where it left off. A file only counts
+as done if it was analysed with the same stride, detector version and
+thresholds as the current run. Per-file summaries
+are written to <output>/summaries/ mirroring the input directory layout.
+
+Usage:
+    python batch_runner.py /data/footage/2024-11-20 --output batch_output --workers 8
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from analysis_cache import DEFAULT_CACHE_DIR, AnalysisCache, file_sha256, thresholds_fingerprint
+from replay import DEFAULT_THRESHOLDS
+
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".m4v")
+
+
+def find_videos(root, extensions=VIDEO_EXTENSIONS):
+    """Walk root and return video paths relative to it, sorted for a stable order"""
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(extensions):
+                found.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(found)
+
+
+def analysis_params(stride=1, thresholds=None):
+    """Everything besides the file itself that changes a summary"""
+    from detector import DETECTOR_VERSION
+    return {
+        "stride": stride,
+        "detector_version": DETECTOR_VERSION,
+        "thresholds": thresholds_fingerprint(dict(DEFAULT_THRESHOLDS, **(thresholds or {}))),
+    }
+
+
+class BatchManifest:
+    """Append-only journal of per-file outcomes; the last entry for a path wins"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash
+                    self.entries[entry["path"]] = entry
+
+        self._file = open(path, "a", encoding="utf-8")
+
+    def is_done(self, rel_path, stat, params):
+        """Finished with this file version and the same analysis_params()"""
+        entry = self.entries.get(rel_path)
+        return (entry is not None and entry["status"] == "done"
+                and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+                and all(entry.get(key) == value for key, value in params.items()))
+
+    def record(self, entry):
+        self.entries[entry["path"]] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def process_file(root, rel_path, output_dir, cache_dir, stride=1):
+    """
+    Worker: analyse one file and write its summary
+
+    Returns:
+        dict: Manifest entry for the file
+    """
+    path = os.path.join(root, rel_path)
+    stat = os.stat(path)
+    start = time.time()
+
+    summary = AnalysisCache(cache_dir).analyze(path, video_hash=file_sha256(path), stride=stride)
+
+    summary_path = os.path.join(output_dir, "summaries", rel_path + ".json")
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(dict(summary, path=rel_path), f, indent=2)
+
+    return dict(analysis_params(stride), **{
+        "path": rel_path,
+        "status": "done",
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "frames": summary["source_frames"],
+        "analysed_frames": summary["frames"],
+        "cache": summary["cache"],
+        "seconds": round(time.time() - start, 3),
+        "summary": summary_path,
+    })
+
+
+def run_batch(root, output_dir="batch_output", cache_dir=DEFAULT_CACHE_DIR, max_workers=None,
+              extensions=VIDEO_EXTENSIONS, stride=1):
+    """
+    Analyse every video under root, skipping files already finished
+
+    With stride > 1 only every Nth frame is decoded and analysed; the rest
+    are skipped with grab(), which avoids the colour conversion entirely.
+
+    Returns:
+        dict: Run statistics including aggregate frames per second
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = BatchManifest(os.path.join(output_dir, "manifest.jsonl"))
+
+    videos = find_videos(root, extensions)
+    params = analysis_params(stride)
+    todo = [v for v in videos if not manifest.is_done(v, os.stat(os.path.join(root, v)), params)]
+    print(f"📂 {len(videos)} videos found, {len(videos) - len(todo)} already done, {len(todo)} to process")
+
+    start = time.time()
+    frames = 0
+    decoded_frames = 0
+    failed = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(process_file, root, v, output_dir, cache_dir, stride): v
+                       for v in todo}
+            for done, future in enumerate(as_completed(futures), start=1):
+                rel_path = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    failed += 1
+                    stat = os.stat(os.path.join(root, rel_path))
+                    manifest.record({"path": rel_path, "status": "failed", "error": str(e),
+                                     "size": stat.st_size, "mtime": stat.st_mtime})
+                    print(f"❌ [{done}/{len(todo)}] {rel_path}: {e}")
+                    continue
+
+                manifest.record(entry)
+                frames += entry["frames"]
+                if entry["cache"] == "miss":
+                    decoded_frames += entry["analysed_frames"]
+
+                elapsed = time.time() - start
+                print(f"✅ [{done}/{len(todo)}] {rel_path} - {entry['frames']} frames "
+                      f"({entry['cache']}), {frames / elapsed:,.0f} fps overall")
+    finally:
+        manifest.close()
+
+    elapsed = time.time() - start
+    return {
+        "videos": len(videos),
+        "processed": len(todo) - failed,
+        "skipped": len(videos) - len(todo),
+        "failed": failed,
+        "frames": frames,
+        "decoded_frames": decoded_frames,
+        "seconds": round(elapsed, 1),
+        "fps": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+        "decode_fps": round(decoded_frames / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VigilDrive AI batch analysis of fleet footage")
+    parser.add_argument("root", help="Directory to scan for videos")
+    parser.add_argument("--output", default="batch_output", help="Manifest and summary directory")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Analysis cache directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--stride", type=int, default=1, help="Analyse every Nth frame")
+    args = parser.parse_args()
+    if args.stride < 1:
+        parser.error("--stride must be at least 1")
+
+    stats = run_batch(args.root, args.output, args.cache_dir, args.workers, stride=args.stride)
+
+    print()
+    print("=" * 60)
+    print("📊 BATCH SUMMARY")
+    print("=" * 60)
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+VigilDrive AI - Blink Events
+Stream of eye-closure events with windowed statistics
+
+Every closure the detector sees becomes one event (start, end, duration,
+kind). Events go into a fixed-size ring together with running totals -
+blink count, blink duration sum, long-closure count and a duration
+histogram - taken after each event. Statistics for any window are the
+difference of two running totals, found by binary search on event end
+times, so no frames or events are rescanned.
+"""
+
+import numpy as np
+
+
+# Closure duration histogram bin edges (seconds); the last bin is open-ended
+DURATION_BINS = (0.0, 0.1, 0.2, 0.3, 0.4, 0.6, 1.0, 1.5, 2.0, 3.0)
+
+
+class BlinkEventLog:
+    """Ring of closure events with O(log n) statistics over any time window"""
+
+    def __init__(self, capacity=4096, blink_max_duration=0.4, long_closure_seconds=1.0,
+                 bins=DURATION_BINS):
+        """
+        Args:
+            capacity: Events kept in the ring
+            blink_max_duration: Closures shorter than this are blinks
+            long_closure_seconds: Closures at least this long are long closures
+            bins: Histogram bin edges in seconds
+        """
+        self.capacity = capacity
+        self.blink_max_duration = blink_max_duration
+        self.long_closure_seconds = long_closure_seconds
+        self.bins = np.asarray(bins, dtype=np.float64)
+
+        self._start = np.zeros(capacity)
+        self._end = np.zeros(capacity)
+        # Running totals after each event: blinks, blink seconds, long closures,
+        # then one column per histogram bin
+        self._totals = np.zeros((capacity, 3 + len(self.bins)))
+        self._running = np.zeros(3 + len(self.bins))
+        self._head = 0  # index of the oldest event
+        self._size = 0
+        self.total_events = 0
+
+    def __len__(self):
+        return self._size
+
+    def _slot(self, i):
+        return (self._head + i) % self.capacity
+
+    def kind(self, duration):
+        if duration < self.blink_max_duration:
+            return "blink"
+        if duration >= self.long_closure_seconds:
+            return "long_closure"
+        return "closure"
+
+    def record(self, start, end):
+        """
+        Add a closure that ran from start to end (seconds)
+
+        Returns:
+            dict: The event - start, end, duration and kind
+        """
+        duration = end - start
+        kind = self.kind(duration)
+        self._running += self._contribution(duration)
+
+        if self._size == self.capacity:
+            slot = self._head
+            self._head = (self._head + 1) % self.capacity
+        else:
+            slot = self._slot(self._size)
+            self._size += 1
+        self._start[slot] = start
+        self._end[slot] = end
+        self._totals[slot] = self._running
+        self.total_events += 1
+
+        return {"start": start, "end": end, "duration": duration, "kind": kind}
+
+    def _count_ending_by(self, ts):
+        """Number of ring events with end <= ts (binary search over the ring)"""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._end[self._slot(mid)] <= ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def window_stats(self, start, end):
+        """
+        Statistics for events ending in (start, end]
+
+        Returns:
+            dict: blinks, blink_rate (per minute of window), mean_blink_duration,
+                long_closures, histogram (counts per bin), bin_edges and
+                complete (False if the window reaches back past the ring)
+        """
+        if self._size == 0:
+            first = last = 0
+            window = np.zeros_like(self._running)
+        else:
+            first = self._count_ending_by(start)
+            last = self._count_ending_by(end)
+            if last == 0:
+                window = np.zeros_like(self._running)
+            else:
+                upper = self._totals[self._slot(last - 1)]
+                lower = self._totals[self._slot(first - 1)] if first > 0 else self._oldest_baseline()
+                window = upper - lower
+
+        minutes = (end - start) / 60.0
+        blinks = int(window[0])
+        return {
+            "blinks": blinks,
+            "blink_rate": round(blinks / minutes, 2) if minutes > 0 else 0.0,
+            "mean_blink_duration": round(window[1] / blinks, 3) if blinks else 0.0,
+            "long_closures": int(window[2]),
+            "histogram": [int(c) for c in window[3:]],
+            "bin_edges": [float(b) for b in self.bins],
+            "complete": self._size == 0 or first > 0 or self.total_events == self._size
+                        or start >= self._end[self._head],
+        }
+
+    def _contribution(self, duration):
+        """One event's share of the running totals"""
+        kind = self.kind(duration)
+        row = np.zeros_like(self._running)
+        row[0] = kind == "blink"
+        row[1] = duration if kind == "blink" else 0.0
+        row[2] = kind == "long_closure"
+        row[3 + np.searchsorted(self.bins, duration, side="right") - 1] = 1
+        return row
+
+    def _oldest_baseline(self):
+        """Running totals before the oldest event still in the ring"""
+        duration = self._end[self._head] - self._start[self._head]
+        return self._totals[self._head] - self._contribution(duration)
+
+    def recent_stats(self, now, seconds=60.0):
+        """window_stats for the last `seconds` up to now"""
+        return self.window_stats(now - seconds, now)
+
+    def histogram(self):
+        """All-time duration histogram as (bin_edges, counts)"""
+        return [float(b) for b in self.bins], [int(c) for c in self._running[3:]]
+
+    def events(self, since=None):
+        """Events still in the ring, oldest first, optionally ending after `since`"""
+        first = 0 if since is None else self._count_ending_by(since)
+        for i in range(first, self._size):
+            slot = self._slot(i)
+            start, end = float(self._start[slot]), float(self._end[slot])
+            yield {"start": start, "end": end, "duration": end - start, "kind": self.kind(end - start)}
+
+
+def compare_blinks(reference, candidate, tolerance=0.1):
+    """
+    Match two blink event streams, e.g. a cheaper pipeline against the
+    every-frame one
+
+    Args:
+        reference: Events (dicts from BlinkEventLog.record) taken as truth
+        candidate: Events to check
+        tolerance: Max start-time difference (seconds) for a match
+
+    Returns:
+        dict: Blink counts, matches, recall, precision and the mean absolute
+            duration error of matched blinks
+    """
+    ref = sorted(e["start"] for e in reference if e["kind"] == "blink")
+    ref_durations = {e["start"]: e["duration"] for e in reference if e["kind"] == "blink"}
+    cand = sorted((e["start"], e["duration"]) for e in candidate if e["kind"] == "blink")
+
+    matched = 0
+    duration_error = 0.0
+    i = 0
+    for start, duration in cand:
+        while i < len(ref) and ref[i] < start - tolerance:
+            i += 1
+        if i < len(ref) and abs(ref[i] - start) <= tolerance:
+            matched += 1
+            duration_error += abs(ref_durations[ref[i]] - duration)
+            i += 1
+
+    return {
+        "reference_blinks": len(ref),
+        "candidate_blinks": len(cand),
+        "matched": matched,
+        "recall": round(matched / len(ref), 3) if ref else 1.0,
+        "precision": round(matched / len(cand), 3) if cand else 1.0,
+        "mean_duration_error": round(duration_error / matched, 3) if matched else 0.0,
+    }
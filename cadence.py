@@ -0,0 +1,186 @@
+"""
+VigilDrive AI - Adaptive Cadence
+Decides which frames the detector actually analyses
+
+After a long stretch of confident LOW results the analysed rate is relaxed
+towards one frame per max_gap_seconds, saving CPU on battery-powered units.
+As PERCLOS or closure duration climb towards the MEDIUM thresholds the
+interval shrinks back to zero (every frame), and any non-LOW result restores
+full rate immediately.
+
+PresenceMonitor covers the opposite case: with nobody in the cab there is
+nothing to analyse, so face-less stretches drop to a slow low-resolution scan.
+"""
+
+
+class CadenceController:
+    """Analysed-frame interval driven by the detector's own results"""
+
+    def __init__(self, max_gap_seconds=0.1, stable_seconds=120.0, min_confidence=0.9,
+                 medium_perclos=0.15, medium_closed=1.0, relaxed_share=0.5):
+        """
+        Args:
+            max_gap_seconds: Longest time between analysed frames, in any state.
+                A closure is only seen if an analysed frame lands inside it, so
+                this must stay below the shortest blink that should count: the
+                0.1 s default samples every closure of 100 ms or more, which
+                covers nearly all normal blinks (about 100-400 ms). At 0.2 s,
+                blinks of 100-200 ms are often missed and blink_rate reads low
+            stable_seconds: How long results must stay confidently LOW before
+                the rate is lowered
+            min_confidence: Confidence a LOW result needs to count as stable
+            medium_perclos: PERCLOS at which full rate is restored
+            medium_closed: Closure duration (seconds) at which full rate is restored
+            relaxed_share: Share of the MEDIUM thresholds below which the
+                full max_gap_seconds applies. An alert driver's PERCLOS from
+                normal blinking alone is about a third of MEDIUM, so the
+                interval only starts shrinking above that
+        """
+        self.max_gap_seconds = max_gap_seconds
+        self.stable_seconds = stable_seconds
+        self.min_confidence = min_confidence
+        self.medium_perclos = medium_perclos
+        self.medium_closed = medium_closed
+        self.relaxed_share = relaxed_share
+
+        # Floor raised by the load-shedding controller when the unit falls behind
+        self.min_interval_seconds = 0.0
+
+        self.interval = 0.0
+        self.stable_since = None
+        self.last_analyzed = None
+        self.last_seen = None
+        self.frame_period = 0.0
+        self.analyzed_frames = 0
+        self.skipped_frames = 0
+
+    def should_analyze(self, now):
+        """
+        Whether the frame at time now should be analysed
+
+        A frame is skipped only if the next one (one frame period later) would
+        still be within the current interval, so gaps never exceed it.
+        """
+        if self.last_seen is not None and now > self.last_seen:
+            self.frame_period = now - self.last_seen
+        self.last_seen = now
+
+        if self.last_analyzed is None or self.interval <= 0:
+            analyze = True
+        else:
+            analyze = (now - self.last_analyzed) + self.frame_period > self.interval + 1e-6
+
+        if analyze:
+            self.last_analyzed = now
+            self.analyzed_frames += 1
+        else:
+            self.skipped_frames += 1
+        return analyze
+
+    def update(self, result, now):
+        """Set the interval from the result of an analysed frame"""
+        metrics = result["metrics"]
+        stable = (result["alert_level"] == "LOW"
+                  and result["confidence"] >= self.min_confidence
+                  and metrics["face_detected"])
+        if not stable:
+            self.stable_since = None
+            self._set_interval(0.0)
+            return
+
+        if self.stable_since is None:
+            self.stable_since = now
+        if now - self.stable_since < self.stable_seconds:
+            self._set_interval(0.0)
+            return
+
+        # Shrink the interval linearly as either metric goes from the relaxed
+        # share of MEDIUM up to MEDIUM itself
+        share = max(metrics["perclos"] / self.medium_perclos,
+                    metrics["eye_closed_duration"] / self.medium_closed)
+        risk = (share - self.relaxed_share) / (1.0 - self.relaxed_share)
+        self._set_interval(self.max_gap_seconds * max(0.0, 1.0 - min(risk, 1.0)))
+
+    def _set_interval(self, interval):
+        self.interval = min(max(interval, self.min_interval_seconds), self.max_gap_seconds)
+
+    def reset(self):
+        """Return to full rate, e.g. after the camera was restarted"""
+        self.interval = 0.0
+        self.stable_since = None
+        self.last_analyzed = None
+        self.last_seen = None
+
+    def stats(self):
+        total = self.analyzed_frames + self.skipped_frames
+        return {
+            "analyzed_frames": self.analyzed_frames,
+            "skipped_frames": self.skipped_frames,
+            "analyzed_ratio": round(self.analyzed_frames / total, 3) if total else 1.0,
+            "interval_seconds": round(self.interval, 3),
+        }
+
+
+class PresenceMonitor:
+    """Switches to a low-rate, low-resolution face scan while no face is present"""
+
+    def __init__(self, absent_frames=30, scan_interval_seconds=0.5, scan_scale=0.5):
+        """
+        Args:
+            absent_frames: Consecutive face-less frames before scanning starts
+            scan_interval_seconds: Time between scans while scanning
+            scan_scale: Frame downscale factor used for the scan
+        """
+        self.absent_frames = absent_frames
+        self.scan_interval_seconds = scan_interval_seconds
+        self.scan_scale = scan_scale
+
+        self.scanning = False
+        self.faceless_frames = 0
+        self.last_scan = None
+        self.last_seen = None
+        self.mode_seconds = {"active": 0.0, "scanning": 0.0}
+        self.mode_changes = 0
+        self.scans = 0
+
+    def tick(self, now):
+        """Account the time since the previous frame to the current mode"""
+        if self.last_seen is not None and now > self.last_seen:
+            self.mode_seconds["scanning" if self.scanning else "active"] += now - self.last_seen
+        self.last_seen = now
+
+    def should_scan(self, now):
+        """While scanning, whether this frame is due for a scan"""
+        if self.last_scan is not None and now - self.last_scan < self.scan_interval_seconds:
+            return False
+        self.last_scan = now
+        self.scans += 1
+        return True
+
+    def update(self, face_found, now):
+        """Record whether the analysed frame had a face and switch mode if needed"""
+        if face_found:
+            self.faceless_frames = 0
+            if self.scanning:
+                self.scanning = False
+                self.mode_changes += 1
+                print("👤 Face found - back to full-rate detection")
+            return
+
+        self.faceless_frames += 1
+        if not self.scanning and self.faceless_frames >= self.absent_frames:
+            self.scanning = True
+            self.last_scan = now
+            self.mode_changes += 1
+            print(f"💤 No face for {self.faceless_frames} frames - low-power scanning")
+
+    def stats(self):
+        total = self.mode_seconds["active"] + self.mode_seconds["scanning"]
+        return {
+            "mode": "scanning" if self.scanning else "active",
+            "active_seconds": round(self.mode_seconds["active"], 1),
+            "scanning_seconds": round(self.mode_seconds["scanning"], 1),
+            "scanning_share": round(self.mode_seconds["scanning"] / total, 3) if total else 0.0,
+            "mode_changes": self.mode_changes,
+            "scans": self.scans,
+        }
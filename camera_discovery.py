@@ -0,0 +1,173 @@
+"""
+VigilDrive AI - Camera Discovery
+Finds a working camera once and reopens it directly on later starts
+
+Probing tries every video device with each capture backend that exists on
+this platform (V4L2 on Linux, AVFoundation on macOS, Media Foundation /
+DirectShow on Windows) until one delivers a frame. The device, backend,
+resolution and FPS that worked are cached as JSON, so the next start
+opens exactly that configuration instead of probing again.
+
+If the cached device has disappeared (on Linux its /dev/video node is
+checked before any open is attempted) or fails to deliver a frame, the
+cache is dropped and the remaining devices are probed.
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import cv2
+
+
+DEFAULT_CAMERA_CACHE = "camera_config.json"
+MAX_PROBE_DEVICES = 4  # indices tried where devices cannot be listed
+
+
+def candidate_backends():
+    """Capture backends worth trying on this platform, best first"""
+    if sys.platform.startswith("linux"):
+        names = ["CAP_V4L2", "CAP_ANY"]
+    elif sys.platform == "darwin":
+        names = ["CAP_AVFOUNDATION", "CAP_ANY"]
+    elif sys.platform == "win32":
+        names = ["CAP_MSMF", "CAP_DSHOW", "CAP_ANY"]
+    else:
+        names = ["CAP_ANY"]
+    return [getattr(cv2, name) for name in names if hasattr(cv2, name)]
+
+
+def list_devices():
+    """Camera indices to probe (the /dev/video* nodes on Linux)"""
+    if sys.platform.startswith("linux"):
+        nodes = glob.glob("/dev/video[0-9]*")
+        return sorted(int(node[len("/dev/video"):]) for node in nodes
+                      if node[len("/dev/video"):].isdigit())
+    return list(range(MAX_PROBE_DEVICES))
+
+
+def device_present(device):
+    """Cheap check before opening; only Linux can answer without an open"""
+    if sys.platform.startswith("linux"):
+        return os.path.exists(f"/dev/video{device}")
+    return True
+
+
+def _open(device, backend, config=None):
+    """Open device with backend and return the capture only if it delivers a frame"""
+    cap = cv2.VideoCapture(device, backend)
+    if not cap.isOpened():
+        cap.release()
+        return None
+
+    if config is not None:
+        for prop, key in ((cv2.CAP_PROP_FRAME_WIDTH, "width"),
+                          (cv2.CAP_PROP_FRAME_HEIGHT, "height"),
+                          (cv2.CAP_PROP_FPS, "fps")):
+            if config.get(key) and cap.get(prop) != config[key]:
+                cap.set(prop, config[key])
+
+    ok, _ = cap.read()
+    if not ok:
+        cap.release()
+        return None
+    return cap
+
+
+def _describe(cap, device, backend):
+    return {
+        "platform": sys.platform,
+        "device": device,
+        "backend": backend,
+        "backend_name": cap.getBackendName(),
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS) or None,
+        "probed_at": datetime.now().isoformat(),
+    }
+
+
+def probe_cameras(devices=None, backends=None, keep_open=False):
+    """
+    Try each device with each backend; the first backend that works wins
+
+    Args:
+        devices: Indices to try (defaults to list_devices())
+        backends: Backends to try (defaults to candidate_backends())
+        keep_open: Return the first working capture open instead of probing
+            the remaining devices
+
+    Returns:
+        tuple: (list of working configs, open capture or None)
+    """
+    configs = []
+    for device in list_devices() if devices is None else devices:
+        for backend in candidate_backends() if backends is None else backends:
+            cap = _open(device, backend)
+            if cap is None:
+                continue
+            configs.append(_describe(cap, device, backend))
+            if keep_open:
+                return configs, cap
+            cap.release()
+            break
+    return configs, None
+
+
+def load_config(cache_path=DEFAULT_CAMERA_CACHE):
+    """Cached camera config for this platform, or None"""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable camera cache: {e}")
+        return None
+    return config if config.get("platform") == sys.platform else None
+
+
+def save_config(config, cache_path=DEFAULT_CAMERA_CACHE):
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+
+def open_camera(cache_path=DEFAULT_CAMERA_CACHE, reprobe=False):
+    """
+    Open the cached camera, probing only when there is no usable cache
+
+    Args:
+        cache_path: JSON file holding the last working configuration
+        reprobe: Ignore the cache and probe again
+
+    Returns:
+        tuple: (opened cv2.VideoCapture or None, config dict with the time
+            the camera took to become ready in open_ms)
+    """
+    start = time.perf_counter()
+    config = None if reprobe else load_config(cache_path)
+
+    if config is not None:
+        if device_present(config["device"]):
+            cap = _open(config["device"], config["backend"], config)
+            if cap is not None:
+                return cap, dict(config, source="cache",
+                                 open_ms=round((time.perf_counter() - start) * 1000, 1))
+        print(f"⚠️  Cached camera {config['device']} ({config['backend_name']}) is gone, probing")
+
+    devices = list_devices()
+    if config is not None:
+        # Skip the device that just failed
+        devices = [d for d in devices if d != config["device"]]
+    configs, cap = probe_cameras(devices, keep_open=True)
+    if cap is None:
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        return None, None
+
+    save_config(configs[0], cache_path)
+    return cap, dict(configs[0], source="probe",
+                     open_ms=round((time.perf_counter() - start) * 1000, 1))
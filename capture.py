@@ -0,0 +1,227 @@
+"""
+VigilDrive AI - Camera Capture
+Grayscale-native frame source for the detector
+
+Detection only needs luminance, but a default VideoCapture decodes every
+frame to BGR and the detector then converts it back to gray. GrayCapture
+asks the camera for raw YUYV instead and hands over the Y plane, so no
+colour is decoded or converted at all. Cameras and files that cannot
+deliver raw frames fall back to a single BGR-to-gray conversion on read.
+
+Frames stay single-channel for detection. A preview asks colour() for the
+frame it is about to show; only then is the raw frame converted, so frames
+that are analysed but not displayed never pay for colour.
+
+Latency: cameras are opened with a one-frame buffer, and a reader that
+fell behind drains whatever is queued so it always gets the freshest
+frame. Buffered frames come back from grab() immediately while a fresh
+one has to wait for the sensor, which is how queued frames are told
+apart. Each frame is stamped with its capture time, so its age when
+processing finishes can be reported. The capture time comes from the
+driver's buffer timestamp where the backend exposes one (V4L2 reports it
+on the monotonic clock through CAP_PROP_POS_MSEC); otherwise it is the
+moment grab() returned, and frame age is then a lower bound that misses
+the time the frame spent queued before the grab.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+
+YUYV = cv2.VideoWriter_fourcc(*"YUYV")
+
+
+class GrayCapture:
+    """Drop-in for cv2.VideoCapture whose read() returns grayscale frames"""
+
+    def __init__(self, source=0, raw=True, buffer_size=1, drain=None, max_drain=10):
+        """
+        Args:
+            source: Camera index, file path or an opened cv2.VideoCapture
+            raw: Try raw YUYV capture and take the Y plane (cameras only)
+            buffer_size: Frames the backend may queue (not every backend obeys)
+            drain: Skip queued frames when behind (defaults to True except
+                for video files, where every frame matters)
+            max_drain: Most queued frames dropped in one read
+        """
+        live = not isinstance(source, str)
+        self.live = live
+        self.cap = source if isinstance(source, cv2.VideoCapture) else cv2.VideoCapture(source)
+        self.mode = "bgr"  # "yuyv" once raw capture is confirmed
+        self._raw = None  # frame as captured, for colour()
+        self.drain = live if drain is None else drain
+        self.max_drain = max_drain
+        self._pending = None
+        self.frames = 0
+        self.convert_seconds = 0.0
+
+        self.captured_at = None  # wall-clock capture time of the last frame read
+        self.timestamp_source = None  # "driver" or "grab" (lower bound), per frame
+        self.last_drained = 0  # queued frames skipped by the last read
+        self.drained = 0
+        self._read_at = None
+        self._age_sum = 0.0
+        self._age_max = 0.0
+        self._ages = 0
+
+        if live and self.cap.isOpened():
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+            fps = self.cap.get(cv2.CAP_PROP_FPS)
+            self.frame_period = 1.0 / fps if fps and fps > 0 else 1.0 / 30
+            if raw:
+                self._try_raw()
+        else:
+            self.frame_period = 1.0 / 30
+
+    def _try_raw(self):
+        self.cap.set(cv2.CAP_PROP_FOURCC, YUYV)
+        if not self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+            return
+        ok, frame = self.cap.read()
+        gray = self._y_plane(frame) if ok else None
+        if gray is None:
+            # Backend ignored the request; go back to decoded frames
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            return
+        self.mode = "yuyv"
+        self._pending = gray
+        self._pending_raw = frame
+        self._pending_at = time.time()
+
+    def _y_plane(self, raw):
+        """Luminance of a packed YUYV frame (Y U Y V ...), or None if it is not one"""
+        if raw is None:
+            return None
+        packed = self._packed(raw)
+        return None if packed is None else np.ascontiguousarray(packed[:, :, 0])
+
+    def _packed(self, raw):
+        """Raw YUYV frame as (h, w, 2), or None if it is not one"""
+        if raw.ndim == 3 and raw.shape[2] == 2:
+            return raw
+        # Most backends return raw frames as one flat row of bytes
+        w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if w <= 0 or h <= 0 or raw.size != w * h * 2:
+            return None
+        return raw.reshape(h, w, 2)
+
+    def _grab_latest(self):
+        """grab() the freshest frame, dropping queued ones if the reader fell behind"""
+        behind = self._read_at is not None and time.time() - self._read_at > self.frame_period
+        start = time.perf_counter()
+        if not self.cap.grab():
+            return False
+        self.last_drained = 0
+        if self.drain and behind:
+            # An instant grab means the frame was queued; keep going until
+            # one has to wait for the sensor
+            while (self.last_drained < self.max_drain
+                   and time.perf_counter() - start < self.frame_period / 4):
+                start = time.perf_counter()
+                if not self.cap.grab():
+                    break
+                self.last_drained += 1
+            self.drained += self.last_drained
+        return True
+
+    def _queued_seconds(self):
+        """How long the grabbed frame waited since the driver stamped it (0 if unknown)"""
+        if self.live:
+            stamp = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+            if stamp > 0:
+                waited = time.monotonic() - stamp / 1000.0
+                # Backends that report something else (stream position, a
+                # different clock) give implausible values and are ignored
+                if 0.0 <= waited < 5.0:
+                    self.timestamp_source = "driver"
+                    return waited
+        self.timestamp_source = "grab"
+        return 0.0
+
+    def read(self):
+        """
+        Read the freshest frame and stamp its capture time (captured_at)
+
+        Returns:
+            tuple: (ok, gray frame or None)
+        """
+        if self._pending is not None:
+            gray, self._pending = self._pending, None
+            self._raw = self._pending_raw
+            self.captured_at = self._read_at = self._pending_at
+            self.frames += 1
+            return True, gray
+
+        if not self._grab_latest():
+            return False, None
+        self._read_at = time.time()
+        self.captured_at = self._read_at - self._queued_seconds()
+        ok, frame = self.cap.retrieve()
+        if not ok:
+            return False, None
+        self._raw = frame
+
+        start = time.perf_counter()
+        if self.mode == "yuyv":
+            gray = self._y_plane(frame)
+        elif frame.ndim == 2:
+            gray = frame
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.convert_seconds += time.perf_counter() - start
+        self.frames += 1
+        return gray is not None, gray
+
+    def colour(self):
+        """
+        BGR version of the last frame read, for display. Converts from raw
+        YUYV on demand; in BGR mode the decoded frame is returned as-is.
+        """
+        if self._raw is None:
+            return None
+        if self.mode == "yuyv":
+            return cv2.cvtColor(self._packed(self._raw), cv2.COLOR_YUV2BGR_YUYV)
+        if self._raw.ndim == 2:
+            return cv2.cvtColor(self._raw, cv2.COLOR_GRAY2BGR)
+        return self._raw
+
+    def frame_age(self, now=None):
+        """
+        Seconds since the last frame read was captured; call once per frame
+        when processing finishes so the age statistics cover every frame
+        """
+        if self.captured_at is None:
+            return 0.0
+        age = (time.time() if now is None else now) - self.captured_at
+        self._age_sum += age
+        self._age_max = max(self._age_max, age)
+        self._ages += 1
+        return age
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "frames": self.frames,
+            "drained_frames": self.drained,
+            "mean_convert_ms": round(self.convert_seconds * 1000 / self.frames, 4) if self.frames else 0.0,
+            "mean_frame_age_ms": round(self._age_sum * 1000 / self._ages, 1) if self._ages else 0.0,
+            "max_frame_age_ms": round(self._age_max * 1000, 1),
+            "timestamp_source": self.timestamp_source,
+        }
+
+
+def to_display(frame):
+    """RGB (or single-channel) image for st.image; converts only colour frames"""
+    return frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
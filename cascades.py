@@ -0,0 +1,86 @@
+"""
+VigilDrive AI - Cascade Registry
+Process-wide cache of OpenCV cascade classifiers
+
+Every detector, backend and privacy filter asks this registry for its
+cascades, so each XML model is read and parsed once per process however
+many of them are created. A classifier can also be warmed up with one
+detection on a blank frame, so the first real frame does not pay for
+OpenCV's lazy internal setup. Load and warm-up times are kept for
+reporting.
+
+cv2.CascadeClassifier is not thread-safe, and every Streamlit session runs
+on its own thread, so callers get a SharedCascade that serialises
+detectMultiScale on a per-model lock.
+"""
+
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+FACE_CASCADE = "haarcascade_frontalface_default.xml"
+EYE_CASCADE = "haarcascade_eye.xml"
+
+_classifiers = {}
+_timings = {}
+_lock = threading.Lock()
+
+
+class SharedCascade:
+    """A process-wide classifier whose detections run one at a time"""
+
+    def __init__(self, classifier):
+        self._classifier = classifier
+        self._lock = threading.Lock()
+
+    def detectMultiScale(self, image, *args, **kwargs):
+        with self._lock:
+            return self._classifier.detectMultiScale(image, *args, **kwargs)
+
+    def empty(self):
+        return self._classifier.empty()
+
+
+def _resolve(name):
+    """Bare file names refer to OpenCV's bundled Haar cascades"""
+    return name if os.path.dirname(name) else cv2.data.haarcascades + name
+
+
+def get_cascade(name, warm_up=False):
+    """
+    Shared classifier for a cascade file, loading it on first use
+
+    Args:
+        name: Cascade file name (from cv2.data.haarcascades) or full path
+        warm_up: Run one detection on a blank frame if not done yet
+
+    Returns:
+        SharedCascade: Same detectMultiScale interface as cv2.CascadeClassifier
+    """
+    path = _resolve(name)
+    with _lock:
+        classifier = _classifiers.get(path)
+        if classifier is None:
+            start = time.perf_counter()
+            classifier = cv2.CascadeClassifier(path)
+            if classifier.empty():
+                raise IOError(f"Cannot load cascade classifier: {path}")
+            classifier = _classifiers[path] = SharedCascade(classifier)
+            _timings[path] = {"load_ms": round((time.perf_counter() - start) * 1000, 2),
+                              "warm_up_ms": None}
+
+        if warm_up and _timings[path]["warm_up_ms"] is None:
+            start = time.perf_counter()
+            classifier.detectMultiScale(np.zeros((240, 320), dtype=np.uint8))
+            _timings[path]["warm_up_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return classifier
+
+
+def cascade_timings():
+    """Load and warm-up milliseconds per loaded cascade file"""
+    with _lock:
+        return {os.path.basename(path): dict(timing) for path, timing in _timings.items()}
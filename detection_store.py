@@ -0,0 +1,339 @@
+"""
+VigilDrive AI - Detection Store
+SQLite persistence for per-frame detection results, with a retention job
+that rolls old frames up into per-minute summaries and reclaims disk space
+"""
+
+import os
+import sqlite3
+import time
+import argparse
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    alert_level TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    perclos REAL NOT NULL,
+    blink_rate INTEGER NOT NULL,
+    eye_closed_duration REAL NOT NULL,
+    eyes_detected INTEGER NOT NULL,
+    face_detected INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_frames_ts ON frames (ts);
+
+CREATE TABLE IF NOT EXISTS rollups (
+    bucket_start REAL PRIMARY KEY,
+    bucket_seconds INTEGER NOT NULL,
+    frame_count INTEGER NOT NULL,
+    face_frames INTEGER NOT NULL,
+    low_count INTEGER NOT NULL,
+    medium_count INTEGER NOT NULL,
+    high_count INTEGER NOT NULL,
+    perclos_sum REAL NOT NULL,
+    perclos_max REAL NOT NULL,
+    blink_rate_sum REAL NOT NULL,
+    closed_duration_max REAL NOT NULL
+);
+"""
+
+# Sums are stored instead of means so a bucket can be merged across runs
+ROLLUP_UPSERT = """
+INSERT INTO rollups (
+    bucket_start, bucket_seconds, frame_count, face_frames,
+    low_count, medium_count, high_count,
+    perclos_sum, perclos_max, blink_rate_sum, closed_duration_max
+)
+SELECT
+    CAST(ts / :bucket AS INTEGER) * :bucket, :bucket, COUNT(*), SUM(face_detected),
+    SUM(alert_level = 'LOW'), SUM(alert_level = 'MEDIUM'), SUM(alert_level = 'HIGH'),
+    SUM(perclos), MAX(perclos), SUM(blink_rate), MAX(eye_closed_duration)
+FROM frames
+WHERE ts <= :upper AND ts < :cutoff
+GROUP BY 1
+ON CONFLICT (bucket_start) DO UPDATE SET
+    frame_count = frame_count + excluded.frame_count,
+    face_frames = face_frames + excluded.face_frames,
+    low_count = low_count + excluded.low_count,
+    medium_count = medium_count + excluded.medium_count,
+    high_count = high_count + excluded.high_count,
+    perclos_sum = perclos_sum + excluded.perclos_sum,
+    perclos_max = MAX(perclos_max, excluded.perclos_max),
+    blink_rate_sum = blink_rate_sum + excluded.blink_rate_sum,
+    closed_duration_max = MAX(closed_duration_max, excluded.closed_duration_max)
+"""
+
+
+class DetectionStore:
+    """Append-mostly store of detector results backed by SQLite"""
+
+    def __init__(self, db_path="vigildrive.db", commit_every=100, commit_interval_seconds=2.0):
+        """
+        Open (or create) the store
+
+        Args:
+            db_path: SQLite database file
+            commit_every: Rows recorded before they are committed
+            commit_interval_seconds: Longest time a recorded row stays
+                uncommitted (checked on the next record)
+        """
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self.commit_interval_seconds = commit_interval_seconds
+        self._pending = 0
+        self._committed_at = time.time()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+
+        # auto_vacuum only takes effect if set before the first table exists,
+        # which is always the case for stores created by this class
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def record(self, result, ts=None):
+        """
+        Store one detector result
+
+        Args:
+            result: dict returned by DrowsinessDetector.detect_drowsiness
+            ts: Unix timestamp of the frame (defaults to now)
+        """
+        metrics = result["metrics"]
+        self.conn.execute(
+            "INSERT INTO frames (ts, alert_level, confidence, perclos, blink_rate, "
+            "eye_closed_duration, eyes_detected, face_detected) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                time.time() if ts is None else ts,
+                result["alert_level"],
+                result["confidence"],
+                metrics["perclos"],
+                metrics["blink_rate"],
+                metrics["eye_closed_duration"],
+                metrics["eyes_detected"],
+                int(metrics["face_detected"]),
+            ),
+        )
+
+        # Commit in batches: one transaction per frame is too slow, one
+        # transaction per session locks out other connections and loses
+        # everything on a crash
+        self._pending += 1
+        if (self._pending >= self.commit_every
+                or time.time() - self._committed_at >= self.commit_interval_seconds):
+            self.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self._pending = 0
+        self._committed_at = time.time()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def get_rollups(self, start=None, end=None):
+        """Return rollup rows (oldest first) with means derived from the stored sums"""
+        rows = self.conn.execute(
+            "SELECT bucket_start, bucket_seconds, frame_count, face_frames, low_count, "
+            "medium_count, high_count, perclos_sum, perclos_max, blink_rate_sum, "
+            "closed_duration_max FROM rollups WHERE bucket_start >= ? AND bucket_start < ? "
+            "ORDER BY bucket_start",
+            (float("-inf") if start is None else start, float("inf") if end is None else end),
+        ).fetchall()
+
+        return [
+            {
+                "bucket_start": r[0],
+                "bucket_seconds": r[1],
+                "frame_count": r[2],
+                "face_frames": r[3],
+                "alerts": {"LOW": r[4], "MEDIUM": r[5], "HIGH": r[6]},
+                "mean_perclos": r[7] / r[2],
+                "max_perclos": r[8],
+                "mean_blink_rate": r[9] / r[2],
+                "max_eye_closed_duration": r[10],
+            }
+            for r in rows
+        ]
+
+    def size_info(self):
+        """Return page usage of the database file"""
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return {
+            "page_size": page_size,
+            "page_count": page_count,
+            "free_pages": free_pages,
+            "bytes": page_size * page_count,
+        }
+
+
+class RetentionPolicy:
+    """How long each tier of data is kept and how gently it is removed"""
+
+    def __init__(self,
+                 raw_max_age_seconds=24 * 3600,
+                 rollup_max_age_seconds=90 * 24 * 3600,
+                 rollup_bucket_seconds=60,
+                 batch_size=500,
+                 batch_pause_seconds=0.01,
+                 vacuum_pages_per_step=256):
+        """
+        Args:
+            raw_max_age_seconds: Frame rows older than this are rolled up and deleted
+            rollup_max_age_seconds: Rollup rows older than this are deleted
+            rollup_bucket_seconds: Width of each rollup bucket
+            batch_size: Rows handled per transaction
+            batch_pause_seconds: Sleep between transactions so live writers get the lock
+            vacuum_pages_per_step: Pages released per incremental_vacuum call
+        """
+        self.raw_max_age_seconds = raw_max_age_seconds
+        self.rollup_max_age_seconds = rollup_max_age_seconds
+        self.rollup_bucket_seconds = rollup_bucket_seconds
+        self.batch_size = batch_size
+        self.batch_pause_seconds = batch_pause_seconds
+        self.vacuum_pages_per_step = vacuum_pages_per_step
+
+
+def _rollup_raw_frames(store, policy, cutoff):
+    """Fold frames older than cutoff into rollups, one small batch per transaction"""
+    conn = store.conn
+    rolled_up = 0
+
+    while True:
+        # Upper timestamp of the next batch (oldest rows first, via idx_frames_ts)
+        row = conn.execute(
+            "SELECT ts FROM frames WHERE ts < ? ORDER BY ts LIMIT 1 OFFSET ?",
+            (cutoff, policy.batch_size - 1),
+        ).fetchone()
+        upper = row[0] if row else cutoff
+
+        with conn:
+            conn.execute(ROLLUP_UPSERT, {
+                "bucket": policy.rollup_bucket_seconds,
+                "upper": upper,
+                "cutoff": cutoff,
+            })
+            deleted = conn.execute(
+                "DELETE FROM frames WHERE ts <= ? AND ts < ?", (upper, cutoff)
+            ).rowcount
+        rolled_up += deleted
+
+        if row is None or deleted == 0:
+            return rolled_up
+        time.sleep(policy.batch_pause_seconds)
+
+
+def _expire_rollups(store, policy, cutoff):
+    """Delete rollups older than cutoff in small batches"""
+    conn = store.conn
+    expired = 0
+
+    while True:
+        with conn:
+            deleted = conn.execute(
+                "DELETE FROM rollups WHERE rowid IN "
+                "(SELECT rowid FROM rollups WHERE bucket_start < ? ORDER BY bucket_start LIMIT ?)",
+                (cutoff, policy.batch_size),
+            ).rowcount
+        expired += deleted
+
+        if deleted < policy.batch_size:
+            return expired
+        time.sleep(policy.batch_pause_seconds)
+
+
+def _incremental_vacuum(store, policy):
+    """Hand free pages back to the filesystem a few at a time"""
+    conn = store.conn
+
+    # Only stores created with auto_vacuum = INCREMENTAL (2) can do this; on
+    # any other file incremental_vacuum is a no-op
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        while free_pages > 0:
+            conn.execute(f"PRAGMA incremental_vacuum({int(policy.vacuum_pages_per_step)})")
+            conn.commit()
+            remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free_pages:
+                break
+            free_pages = remaining
+            time.sleep(policy.batch_pause_seconds)
+
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def run_retention(store, policy=None, now=None):
+    """
+    Run one retention pass: roll up old frames, expire old rollups, vacuum
+
+    Args:
+        store: DetectionStore instance
+        policy: RetentionPolicy (defaults used if None)
+        now: Reference Unix time (defaults to current time)
+
+    Returns:
+        dict: Rows and bytes reclaimed by this run
+    """
+    policy = policy or RetentionPolicy()
+    now = time.time() if now is None else now
+    started = time.time()
+
+    store.commit()
+    before = store.size_info()
+    rollups_before = store.conn.execute("SELECT COUNT(*) FROM rollups").fetchone()[0]
+
+    frames_rolled_up = _rollup_raw_frames(store, policy, now - policy.raw_max_age_seconds)
+    rollups_after_merge = store.conn.execute("SELECT COUNT(*) FROM rollups").fetchone()[0]
+    rollups_expired = _expire_rollups(store, policy, now - policy.rollup_max_age_seconds)
+    _incremental_vacuum(store, policy)
+
+    after = store.size_info()
+
+    return {
+        "frames_rolled_up": frames_rolled_up,
+        "rollups_created": rollups_after_merge - rollups_before,
+        "rollups_expired": rollups_expired,
+        "rows_reclaimed": frames_rolled_up + rollups_expired,
+        "bytes_before": before["bytes"],
+        "bytes_after": after["bytes"],
+        "bytes_reclaimed": before["bytes"] - after["bytes"],
+        "duration_seconds": round(time.time() - started, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VigilDrive AI detection store retention job")
+    parser.add_argument("--db", default="vigildrive.db", help="Detection store path")
+    parser.add_argument("--raw-hours", type=float, default=24, help="Keep raw frames this long")
+    parser.add_argument("--rollup-days", type=float, default=90, help="Keep rollups this long")
+    parser.add_argument("--bucket-seconds", type=int, default=60, help="Rollup bucket width")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Detection store not found: {args.db}")
+        return
+
+    store = DetectionStore(args.db)
+    policy = RetentionPolicy(
+        raw_max_age_seconds=args.raw_hours * 3600,
+        rollup_max_age_seconds=args.rollup_days * 24 * 3600,
+        rollup_bucket_seconds=args.bucket_seconds,
+        batch_size=args.batch_size,
+    )
+    report = run_retention(store, policy)
+    store.close()
+
+    print("🧹 Retention run complete")
+    for key, value in report.items():
+        print(f"   {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
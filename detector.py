@@ -10,38 +10,133 @@ from datetime import datetime
 import time
 from collections import deque
 
+from backends import EYE_BAND, HaarBackend, create_backend
+from blink_events import BlinkEventLog
+from cadence import CadenceController, PresenceMonitor
+from camera_discovery import open_camera
+from cascades import cascade_timings
+from capture import GrayCapture
+from fatigue_trend import FatigueTrend
+from motion_gate import MotionGate
+from yawn import YawnDetector
+from observation_log import ObservationWriter
+
+# Bumped whenever detection behaviour changes, so cached results keyed on it
+# are invalidated
+DETECTOR_VERSION = "1.3.0"
+
+
+def _ink(frame, color):
+    """Overlay colour for frame; gray frames get the brightest channel"""
+    return color if frame.ndim == 3 else max(color)
+
+
 class DrowsinessDetector:
-    """Simplified drowsiness detection using OpenCV Haar Cascades"""
+    """Simplified drowsiness detection; OpenCV Haar Cascades unless another backend is chosen"""
     
-    def __init__(self):
-        """Initialize detector with Haar Cascades"""
+    def __init__(self, observation_log=None, motion_gate=False, cadence=False, presence=False,
+                 backend="haar", face_rate_hz=None, face_scale=0.5):
+        """
+        Initialize detector with the chosen backend (Haar Cascades by default)
+        
+        Args:
+            observation_log: Optional path; when set, every frame's boxes, counts
+                and brightness (no pixels) are recorded for offline replay
+            motion_gate: True (or a configured MotionGate) to reuse the previous
+                face/eye result on frames where those regions are unchanged
+            cadence: True (or a configured CadenceController) to analyse fewer
+                frames while the driver is stably alert; skipped frames repeat
+                the last result
+            presence: True (or a configured PresenceMonitor) to fall back to a
+                slow low-resolution face scan while nobody is in view
+            backend: Face / eye-state engine, a name registered in
+                backends.BACKENDS ("haar" or "mediapipe") or a backend instance
+            face_rate_hz: Localise faces at this rate (e.g. 5-10) and analyse
+                eye state on every frame inside the cached face box; None
+                localises on every frame
+            face_scale: Downscale for face localisation when face_rate_hz is set
+        """
         
-        # Load Haar Cascade classifiers (built into OpenCV)
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
-        self.eye_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_eye.xml'
-        )
+        # Face and eye-state engine (Haar cascades unless configured otherwise)
+        self.backend = create_backend(backend) if isinstance(backend, str) else backend
         
         # Detection thresholds
         self.EYES_CLOSED_THRESHOLD = 2.0  # seconds
         self.PERCLOS_THRESHOLD = 0.2  # 20% eye closure
+        self.MEDIUM_CLOSED_THRESHOLD = 1.0  # seconds
+        self.MEDIUM_PERCLOS_THRESHOLD = 0.15
+        self.MIN_BLINK_RATE = 10  # blinks/min
+        self.BLINK_MAX_DURATION = 0.4  # seconds
         
         # Tracking variables
         self.eye_closed_start_time = None
         self.eye_closed_duration = 0.0
-        self.blink_counter = 0
+        self.blink_counter = 0  # blinks this session
         self.frame_counter = 0
         self.yawn_counter = 0
         
-        # PERCLOS calculation (60 second window at 30 FPS)
-        self.perclos_window = deque(maxlen=1800)  # 30 * 60
+        # Every closure as a (start, end, duration) event, for windowed
+        # blink statistics without rescanning frames
+        self.blink_events = BlinkEventLog(blink_max_duration=self.BLINK_MAX_DURATION,
+                                          long_closure_seconds=self.MEDIUM_CLOSED_THRESHOLD)
+        
+        # Where PERCLOS and blink rate are heading, for early warnings
+        self.fatigue_trend = FatigueTrend(perclos_threshold=self.PERCLOS_THRESHOLD,
+                                          min_blink_rate=self.MIN_BLINK_RATE)
+        
+        # Yawns are checked a few times per second on the lower-face ROI
+        self.yawn_detector = YawnDetector()
+        
+        # Metric windows are measured in frame time, not frame counts, so they
+        # stay correct when only every Nth frame is analysed
+        self.PERCLOS_WINDOW_SECONDS = 60.0
+        self.BLINK_WINDOW_SECONDS = 60.0
+        self.start_time = None
+        
+        # PERCLOS calculation: (timestamp, closed) pairs from the last 60 seconds
+        self.perclos_window = deque()
+        self.perclos_closed_frames = 0
         
         # Statistics
         self.total_frames = 0
         self.detection_success_frames = 0
         
+        # Display and cost knobs (adjusted by load_shedding.LoadShedder)
+        self.draw_overlay = True
+        self.detection_scale = 1.0  # face detection runs on a frame resized by this
+        
+        # Dual-rate pipeline: faces barely move between frames, blinks last
+        # 100-400 ms, so faces can be localised far less often than eyes
+        self.face_interval_seconds = 0.0 if face_rate_hz is None else 1.0 / face_rate_hz
+        self.face_scale = 1.0 if face_rate_hz is None else face_scale
+        self._cached_faces = None
+        self._faces_at = None
+        
+        # Optional frame-difference gate in front of the cascades
+        if motion_gate is True:
+            motion_gate = MotionGate()
+        self.motion_gate = motion_gate or None
+        
+        # Optional adaptive analysis rate
+        if cadence is True:
+            cadence = CadenceController(medium_perclos=self.MEDIUM_PERCLOS_THRESHOLD,
+                                        medium_closed=self.MEDIUM_CLOSED_THRESHOLD)
+        self.cadence = cadence or None
+        self.last_result = None
+        
+        # Optional low-power scanning while no face is present
+        if presence is True:
+            presence = PresenceMonitor()
+        self.presence = presence or None
+        
+        # Privacy-safe observation stream for replaying the scoring logic
+        self.observation_writer = None
+        if observation_log is not None:
+            self.observation_writer = ObservationWriter(observation_log, metadata=dict(
+                self.get_thresholds(),
+                started_at=datetime.now().isoformat(),
+            ))
+        
         print("✅ Detector initialized successfully!")
     
     def calculate_perclos(self):
@@ -49,58 +144,217 @@ class DrowsinessDetector:
         if len(self.perclos_window) == 0:
             return 0.0
         
-        closed_frames = sum(self.perclos_window)
-        total_frames = len(self.perclos_window)
-        
-        return closed_frames / total_frames
+        return self.perclos_closed_frames / len(self.perclos_window)
+    
+    def _update_perclos_window(self, now, eyes_closed):
+        """Add this frame and drop frames older than PERCLOS_WINDOW_SECONDS"""
+        self.perclos_window.append((now, eyes_closed))
+        self.perclos_closed_frames += eyes_closed
+        
+        cutoff = now - self.PERCLOS_WINDOW_SECONDS
+        while self.perclos_window[0][0] <= cutoff:
+            _, was_closed = self.perclos_window.popleft()
+            self.perclos_closed_frames -= was_closed
     
-    def detect_drowsiness(self, frame):
+    def get_thresholds(self):
+        """Current thresholds, keyed as replay.DEFAULT_THRESHOLDS"""
+        return {
+            "eyes_closed_threshold": self.EYES_CLOSED_THRESHOLD,
+            "perclos_threshold": self.PERCLOS_THRESHOLD,
+            "medium_closed_threshold": self.MEDIUM_CLOSED_THRESHOLD,
+            "medium_perclos_threshold": self.MEDIUM_PERCLOS_THRESHOLD,
+            "min_blink_rate": self.MIN_BLINK_RATE,
+            "blink_max_duration": self.BLINK_MAX_DURATION,
+        }
+    
+    def set_thresholds(self, thresholds):
+        """Apply a dict in the get_thresholds() format (missing keys are left unchanged)"""
+        names = {
+            "eyes_closed_threshold": "EYES_CLOSED_THRESHOLD",
+            "perclos_threshold": "PERCLOS_THRESHOLD",
+            "medium_closed_threshold": "MEDIUM_CLOSED_THRESHOLD",
+            "medium_perclos_threshold": "MEDIUM_PERCLOS_THRESHOLD",
+            "min_blink_rate": "MIN_BLINK_RATE",
+            "blink_max_duration": "BLINK_MAX_DURATION",
+        }
+        for key, value in thresholds.items():
+            setattr(self, names[key], value)
+        self.fatigue_trend.perclos_threshold = self.PERCLOS_THRESHOLD
+        self.fatigue_trend.min_blink_rate = self.MIN_BLINK_RATE
+        self.blink_events.blink_max_duration = self.BLINK_MAX_DURATION
+        self.blink_events.long_closure_seconds = self.MEDIUM_CLOSED_THRESHOLD
+    
+    def blink_stats(self, window_seconds=60.0, now=None):
         """
-        Main detection function
-        
-        Args:
-            frame: OpenCV BGR image
-            
-        Returns:
-            dict: Detection results
+        Blink rate, mean blink duration, long closures and duration histogram
+        for closures that ended in the last window_seconds
         """
-        self.frame_counter += 1
-        self.total_frames += 1
-        
-        # Convert to grayscale for detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Default output
-        output = {
+        now = time.time() if now is None else now
+        return self.blink_events.recent_stats(now, window_seconds)
+    
+    def close(self):
+        """Flush and close the observation log, if any, and release the backend"""
+        if self.observation_writer is not None:
+            self.observation_writer.close()
+        self.backend.close()
+    
+    def _record_observation(self, now, gray, faces, face_box=None, eye_boxes=()):
+        if self.observation_writer is not None:
+            self.observation_writer.write(now, face_box, list(eye_boxes), len(faces),
+                                          len(eye_boxes), cv2.mean(gray)[0])
+    
+    def _new_output(self, frame, inference="full"):
+        """Result dict with every key set to its no-detection default"""
+        return {
             "alert_level": "LOW",
             "confidence": 0.0,
             "metrics": {
                 "eye_closed_duration": 0.0,
                 "blink_rate": 0,
                 "perclos": 0.0,
-                "yawn_count": 0,
+                "yawn_count": self.yawn_counter,
                 "eyes_detected": 0,
-                "face_detected": False
+                "face_detected": False,
+                "ear": None  # eye aspect ratio, from landmark backends only
             },
+            "timings": {"yawn_ms": 0.0},  # cost of the reduced-rate yawn check
+            "closure_event": None,  # set on the frame a closure ends
+            "trend": None,  # fatigue_trend.FatigueTrend.update() output once a face is seen
             "timestamp": datetime.now().isoformat(),
-            "frame": frame.copy()
+            "faces": [],
+            "backend": self.backend.name,
+            "inference": inference,  # "full", "eyes" (face reused), "reused", "scan" or "skipped"
+            "frame": frame
         }
+    
+    def _repeat_last_result(self, frame, display_filter):
+        """Output for a frame the cadence controller skipped"""
+        last = self.last_result
+        if display_filter is not None:
+            frame = display_filter(frame, last["faces"])
+        if self.draw_overlay:
+            cv2.putText(frame, f"Status: {last['alert_level']}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        # Levels and metrics carry over; per-frame events and costs do not,
+        # so a closure is never reported twice
+        output = self._new_output(frame, inference="skipped")
+        output.update(alert_level=last["alert_level"], confidence=last["confidence"],
+                      metrics=dict(last["metrics"]), trend=last["trend"], faces=last["faces"])
+        return output
+    
+    def _absent_output(self, frame, display_filter):
+        """Output for a frame skipped between low-power scans"""
+        if display_filter is not None:
+            frame = display_filter(frame, [])
+        if self.draw_overlay:
+            cv2.putText(frame, "No face detected (low-power scan)", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, _ink(frame, (0, 0, 255)), 2)
+        return self._new_output(frame, inference="skipped")
+    
+    def _finish(self, output, now):
+        if self.cadence is not None:
+            self.cadence.update(output, now)
+            self.last_result = output
+        return output
+    
+    def locate_faces(self, gray):
+        """Run one face pass and return all face boxes as (x, y, w, h)"""
+        return self.backend.locate_faces(gray, self.detection_scale * self.face_scale)
+    
+    def scan_faces(self, gray):
+        """Cheap low-resolution face scan used while nobody is in view"""
+        return self.backend.locate_faces(gray, min(self.presence.scan_scale, self.detection_scale))
+    
+    def detect_drowsiness(self, frame, display_filter=None, timestamp=None, display_frame=None):
+        """
+        Main detection function
         
-        # Detect faces
-        faces = self.face_cascade.detectMultiScale(
-            gray, 
-            scaleFactor=1.1, 
-            minNeighbors=5,
-            minSize=(100, 100)
-        )
+        Args:
+            frame: OpenCV BGR image, or a grayscale one to skip colour
+                conversion
+            display_filter: Optional callable(frame, faces) -> frame applied to
+                the returned display frame only (e.g. PrivacyManager.blur_faces),
+                so it reuses this frame's face boxes instead of detecting again
+            timestamp: Frame time in seconds (defaults to the wall clock; pass
+                the video position when analysing recordings)
+            display_frame: Image to annotate, filter and return in place of
+                frame, e.g. the colour version of a gray frame (see
+                GrayCapture.colour). Defaults to frame itself for BGR input
+                and to a copy of it for gray input; overlays on gray images
+                are drawn in white.
+            
+        Returns:
+            dict: Detection results
+        """
+        # Overlay and display_filter only ever touch the display image. Gray
+        # input is the very array detection reads, so it is never drawn on.
+        source = frame
+        if display_frame is None:
+            display_frame = frame.copy() if frame.ndim == 2 else frame
+        frame = display_frame
+        
+        now = time.time() if timestamp is None else timestamp
+        if self.cadence is not None and self.last_result is not None and not self.cadence.should_analyze(now):
+            return self._repeat_last_result(frame, display_filter)
+        if self.presence is not None:
+            self.presence.tick(now)
+            if self.presence.scanning and not self.presence.should_scan(now):
+                return self._absent_output(frame, display_filter)
+        
+        self.frame_counter += 1
+        self.total_frames += 1
+        if self.start_time is None:
+            self.start_time = now
+        
+        # Convert to grayscale for detection (capture.GrayCapture frames already are)
+        gray = source if source.ndim == 2 else cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
+        
+        # Default output
+        output = self._new_output(frame)
+        
+        # Detect faces (the only face pass for this frame), unless the gate
+        # finds the face region unchanged since the last detection
+        faces = None
+        scanning = self.presence is not None and self.presence.scanning
+        if scanning:
+            faces = self.scan_faces(gray)
+            output["inference"] = "scan"
+        if scanning and faces:
+            # Someone is back: switch to a full-resolution pass on this frame
+            faces = None
+            output["inference"] = "full"
+        elif (not scanning and self._faces_at is not None
+              and now - self._faces_at < self.face_interval_seconds):
+            # Dual-rate: reuse the face boxes until the next localisation is due
+            faces = self._cached_faces
+            output["inference"] = "eyes"
+        elif not scanning and self.motion_gate is not None:
+            faces = self.motion_gate.check_faces(gray)
+            if faces is not None:
+                output["inference"] = "eyes"
+        if faces is None:
+            faces = self.locate_faces(gray)
+            self._cached_faces, self._faces_at = faces, now
+            if self.motion_gate is not None:
+                self.motion_gate.store_faces(faces, gray)
+        if self.presence is not None:
+            self.presence.update(len(faces) > 0, now)
+        output["faces"] = faces
+        
+        # Detection has already read the raw pixels, so filtering the
+        # display frame cannot affect the analysis below
+        if display_filter is not None:
+            frame = display_filter(frame, faces)
         
         if len(faces) == 0:
             # No face detected
             output["metrics"]["face_detected"] = False
-            cv2.putText(frame, "No face detected", (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+            if self.draw_overlay:
+                cv2.putText(frame, "No face detected", (10, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, _ink(frame, (0, 0, 255)), 2)
             output["frame"] = frame
-            return output
+            self._record_observation(now, gray, faces)
+            return self._finish(output, now)
         
         # Face detected
         output["metrics"]["face_detected"] = True
@@ -110,59 +364,78 @@ class DrowsinessDetector:
         (x, y, w, h) = max(faces, key=lambda f: f[2] * f[3])
         
         # Draw face rectangle
-        cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
+        if self.draw_overlay:
+            cv2.rectangle(frame, (x, y), (x+w, y+h), _ink(frame, (255, 0, 0)), 2)
         
         # Region of interest for eyes (upper half of face)
-        roi_gray = gray[y:y+int(h*0.6), x:x+w]
-        roi_color = frame[y:y+int(h*0.6), x:x+w]
-        
-        # Detect eyes
-        eyes = self.eye_cascade.detectMultiScale(
-            roi_gray,
-            scaleFactor=1.1,
-            minNeighbors=10,
-            minSize=(20, 20)
-        )
+        roi_gray = gray[y:y+int(h*EYE_BAND), x:x+w]
+        roi_color = frame[y:y+int(h*EYE_BAND), x:x+w]
+        
+        # Detect open eyes; the gate compares the eye band on every frame, so
+        # a blink always forces a fresh pass
+        eye_state = None
+        fresh_eyes = False
+        if self.motion_gate is not None:
+            eye_state = self.motion_gate.check_eyes(roi_gray)
+        if eye_state is None:
+            eye_state = self.backend.eye_state(gray, (x, y, w, h))
+            fresh_eyes = True
+            if self.motion_gate is not None:
+                self.motion_gate.store_eyes(roi_gray, eye_state)
+        elif output["inference"] == "eyes":
+            output["inference"] = "reused"
+        eyes = eye_state["eyes"]
         
         eyes_detected = len(eyes)
         output["metrics"]["eyes_detected"] = eyes_detected
+        output["metrics"]["ear"] = eye_state["ear"]
+        
+        # Yawns: same face box, lower-face ROI only, at a reduced rate
+        output["timings"]["yawn_ms"] = round(self.yawn_detector.update(
+            gray, (x, y, w, h), now, eye_state.get("mar") if fresh_eyes else None), 4)
+        self.yawn_counter = self.yawn_detector.yawn_count
+        output["metrics"]["yawn_count"] = self.yawn_counter
+        self._record_observation(now, gray, faces, (x, y, w, h),
+                                 [(x + ex, y + ey, ew, eh) for (ex, ey, ew, eh) in eyes])
         
         # Draw eye rectangles
-        for (ex, ey, ew, eh) in eyes:
-            cv2.rectangle(roi_color, (ex, ey), (ex+ew, ey+eh), (0, 255, 0), 2)
+        if self.draw_overlay:
+            for (ex, ey, ew, eh) in eyes:
+                cv2.rectangle(roi_color, (ex, ey), (ex+ew, ey+eh), _ink(frame, (0, 255, 0)), 2)
         
         # Determine if eyes are closed
         eyes_closed = eyes_detected < 2  # Less than 2 eyes means likely closed
-        self.perclos_window.append(1 if eyes_closed else 0)
+        self._update_perclos_window(now, eyes_closed)
         
         # Track eye closure duration
         if eyes_closed:
             if self.eye_closed_start_time is None:
-                self.eye_closed_start_time = time.time()
-            self.eye_closed_duration = time.time() - self.eye_closed_start_time
+                self.eye_closed_start_time = now
+            self.eye_closed_duration = now - self.eye_closed_start_time
         else:
             # Eyes opened - check if it was a blink
             if self.eye_closed_start_time is not None:
-                if self.eye_closed_duration < 0.4:  # Quick closure = blink
+                if self.eye_closed_duration < self.BLINK_MAX_DURATION:  # Quick closure = blink
                     self.blink_counter += 1
+                output["closure_event"] = self.blink_events.record(
+                    self.eye_closed_start_time, self.eye_closed_start_time + self.eye_closed_duration)
             
             self.eye_closed_start_time = None
             self.eye_closed_duration = 0.0
         
         output["metrics"]["eye_closed_duration"] = round(self.eye_closed_duration, 2)
         
-        # Calculate blink rate (blinks per minute)
-        elapsed_seconds = self.frame_counter / 30.0  # Assuming 30 FPS
-        if elapsed_seconds > 0:
-            output["metrics"]["blink_rate"] = int((self.blink_counter / elapsed_seconds) * 60)
-        
-        # Reset blink counter every 60 seconds
-        if self.frame_counter % (30 * 60) == 0:
-            self.blink_counter = 0
+        # Calculate blink rate (blinks per minute) over the trailing window,
+        # or over the whole session while it is shorter than that
+        window_seconds = min(self.BLINK_WINDOW_SECONDS, now - self.start_time)
+        if window_seconds > 0:
+            blinks = self.blink_events.recent_stats(now, self.BLINK_WINDOW_SECONDS)["blinks"]
+            output["metrics"]["blink_rate"] = int((blinks / window_seconds) * 60)
         
         # Calculate PERCLOS
         perclos = self.calculate_perclos()
         output["metrics"]["perclos"] = round(perclos, 3)
+        output["trend"] = self.fatigue_trend.update(now, perclos, output["metrics"]["blink_rate"])
         
         # ALERT LEVEL CLASSIFICATION
         if self.eye_closed_duration > self.EYES_CLOSED_THRESHOLD or perclos > self.PERCLOS_THRESHOLD:
@@ -171,9 +444,9 @@ class DrowsinessDetector:
             color = (0, 0, 255)  # Red
             alert_text = "ALERT: DROWSINESS DETECTED!"
         
-        elif (self.eye_closed_duration > 1.0 or 
-              perclos > 0.15 or 
-              output["metrics"]["blink_rate"] < 10):
+        elif (self.eye_closed_duration > self.MEDIUM_CLOSED_THRESHOLD or 
+              perclos > self.MEDIUM_PERCLOS_THRESHOLD or 
+              output["metrics"]["blink_rate"] < self.MIN_BLINK_RATE):
             output["alert_level"] = "MEDIUM"
             output["confidence"] = 0.75
             color = (0, 165, 255)  # Orange
@@ -185,29 +458,31 @@ class DrowsinessDetector:
             color = (0, 255, 0)  # Green
             alert_text = "Status: Alert"
         
-        # Display metrics on frame
-        y_offset = 30
-        cv2.putText(frame, alert_text, (10, y_offset), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-        
-        y_offset += 30
-        cv2.putText(frame, f"Eyes Detected: {eyes_detected}", (10, y_offset),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        y_offset += 25
-        cv2.putText(frame, f"Eyes Closed: {self.eye_closed_duration:.1f}s", (10, y_offset),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        y_offset += 25
-        cv2.putText(frame, f"PERCLOS: {perclos:.2%}", (10, y_offset),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        y_offset += 25
-        cv2.putText(frame, f"Blinks/min: {output['metrics']['blink_rate']}", (10, y_offset),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        # Display metrics on frame (dropped first when the unit is overloaded)
+        if self.draw_overlay:
+            color = _ink(frame, color)
+            y_offset = 30
+            cv2.putText(frame, alert_text, (10, y_offset), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+            
+            y_offset += 30
+            cv2.putText(frame, f"Eyes Detected: {eyes_detected}", (10, y_offset),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, _ink(frame, (255, 255, 255)), 2)
+            
+            y_offset += 25
+            cv2.putText(frame, f"Eyes Closed: {self.eye_closed_duration:.1f}s", (10, y_offset),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, _ink(frame, (255, 255, 255)), 2)
+            
+            y_offset += 25
+            cv2.putText(frame, f"PERCLOS: {perclos:.2%}", (10, y_offset),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, _ink(frame, (255, 255, 255)), 2)
+            
+            y_offset += 25
+            cv2.putText(frame, f"Blinks/min: {output['metrics']['blink_rate']}", (10, y_offset),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, _ink(frame, (255, 255, 255)), 2)
         
         output["frame"] = frame
-        return output
+        return self._finish(output, now)
     
     def get_bias_testing_report(self):
         """Generate bias testing report for IBM Track"""
@@ -243,15 +518,20 @@ def test_detector():
     print()
     
     # Initialize detector
-    detector = DrowsinessDetector()
+    detector = DrowsinessDetector(motion_gate=True, cadence=True, presence=True,
+                                  backend=HaarBackend(warm_up=True))
+    print(f"✅ Cascades: {cascade_timings()}")
     
-    # Try different camera backends for Mac
-    cap = None
-    for backend in [cv2.CAP_AVFOUNDATION, 0]:
-        cap = cv2.VideoCapture(backend)
-        if cap.isOpened():
-            print(f"✅ Webcam opened with backend: {backend}")
-            break
+    # Reopen the camera that worked last time; probe only if it is gone
+    cap, camera = open_camera()
+    if cap is not None:
+        print(f"✅ Webcam {camera['device']} opened with {camera['backend_name']} "
+              f"({camera['width']}x{camera['height']}, from {camera['source']}) "
+              f"in {camera['open_ms']:.0f} ms")
+        # Gray frames straight from the camera, one-frame buffer, stale frames
+        # drained so alerts never run on old footage
+        cap = GrayCapture(cap)
+        print(f"✅ Capture mode: {cap.mode}")
     
     if cap is None or not cap.isOpened():
         print("❌ Error: Cannot access webcam")
@@ -270,15 +550,18 @@ def test_detector():
             print("❌ Error reading frame")
             break
         
-        # Detect drowsiness
-        result = detector.detect_drowsiness(frame)
+        # Detect drowsiness, timed from when the frame was captured
+        result = detector.detect_drowsiness(frame, timestamp=cap.captured_at,
+                                            display_frame=cap.colour())
+        frame_age = cap.frame_age()
         
         # Display annotated frame
         cv2.imshow('VigilDrive AI - Press Q to Quit', result["frame"])
         
         # Print alerts
         if result["alert_level"] != "LOW":
-            print(f"⚠️  {result['alert_level']} - Eyes closed: {result['metrics']['eye_closed_duration']:.1f}s")
+            print(f"⚠️  {result['alert_level']} - Eyes closed: {result['metrics']['eye_closed_duration']:.1f}s "
+                  f"(frame age {frame_age * 1000:.0f} ms)")
         
         # Check for 'q' key
         if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -301,6 +584,12 @@ def test_detector():
                 print(f"  • {item}")
         else:
             print(f"{key}: {value}")
+    print(f"capture: {cap.stats()}")
+    print(f"motion_gate: {detector.motion_gate.stats()}")
+    print(f"cadence: {detector.cadence.stats()}")
+    print(f"presence: {detector.presence.stats()}")
+    print(f"yawn: {detector.yawn_detector.stats()}")
+    print(f"blinks (last 60s): {detector.blink_stats()}")
     
     print()
     print("✅ Detection test complete!")
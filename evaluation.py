@@ -0,0 +1,212 @@
+"""
+VigilDrive AI - Offline Evaluation
+Runs the detector over a labelled clip corpus and writes the metrics shown
+on the Model Card page
+
+Manifest format (CSV with header):
+    path,label,group
+    clips/driver01_alert.mp4,0,Lighter skin tones
+    clips/driver07_drowsy.mp4,1,With glasses;Low light (10-50 lux)
+
+label is 1 for clips where the driver is drowsy and 0 otherwise; group is an
+optional ';'-separated list of bias-testing groups the clip belongs to.
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from analysis_cache import DEFAULT_CACHE_DIR, AnalysisCache, thresholds_fingerprint
+from governance.model_card import DEFAULT_METRICS_PATH
+from replay import DEFAULT_THRESHOLDS
+
+
+FAIRNESS_TOLERANCE = 0.05  # max accuracy gap from overall before a group is flagged
+
+
+def load_manifest(manifest_path):
+    """Read the clip manifest; relative clip paths are resolved against its directory"""
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    clips = []
+    with open(manifest_path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            groups = [g.strip() for g in (row.get("group") or "").split(";") if g.strip()]
+            clips.append({
+                "path": os.path.join(base, row["path"]),
+                "label": int(row["label"]),
+                "groups": groups,
+            })
+    return clips
+
+
+def _analyze_clip(path, video_hash, thresholds, cache_dir):
+    """Worker: summarise one clip through the shared analysis cache"""
+    return AnalysisCache(cache_dir).analyze(path, thresholds, video_hash=video_hash)
+
+
+def _confusion_metrics(rows):
+    tp = sum(1 for r in rows if r["label"] == 1 and r["predicted"] == 1)
+    tn = sum(1 for r in rows if r["label"] == 0 and r["predicted"] == 0)
+    fp = sum(1 for r in rows if r["label"] == 0 and r["predicted"] == 1)
+    fn = sum(1 for r in rows if r["label"] == 1 and r["predicted"] == 0)
+    total = len(rows)
+
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    return {
+        "overall_accuracy": round((tp + tn) / total, 4) if total else 0.0,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1_score": round(f1, 4),
+        "test_dataset_size": total,
+    }
+
+
+def compute_metrics(rows):
+    """
+    Overall and per-group metrics in the shape ModelCard serves
+
+    Args:
+        rows: Dicts with "label", "predicted" and "groups"
+    """
+    overall = _confusion_metrics(rows)
+
+    groups = {}
+    for row in rows:
+        for group in row["groups"]:
+            groups.setdefault(group, []).append(row)
+
+    group_results = []
+    for name in sorted(groups):
+        metrics = _confusion_metrics(groups[name])
+        gap = abs(metrics["overall_accuracy"] - overall["overall_accuracy"])
+        group_results.append({
+            "group": name,
+            "sample_size": metrics["test_dataset_size"],
+            "accuracy": metrics["overall_accuracy"],
+            "precision": metrics["precision"],
+            "recall": metrics["recall"],
+            "status": "PASS" if gap <= FAIRNESS_TOLERANCE else "REVIEW",
+        })
+
+    if group_results:
+        accuracies = [g["accuracy"] for g in group_results]
+        spread = max(accuracies) - min(accuracies)
+        flagged = [g["group"] for g in group_results if g["status"] != "PASS"]
+        if flagged:
+            conclusion = (f"Accuracy spread of {spread * 100:.1f} points across groups; "
+                          f"review needed for: {', '.join(flagged)}")
+        else:
+            conclusion = (f"Accuracy varies by {spread * 100:.1f} points across tested groups, "
+                          f"within the {FAIRNESS_TOLERANCE * 100:.0f}-point tolerance")
+    else:
+        conclusion = "No bias-testing groups in the evaluation corpus"
+
+    return {"overall": overall, "groups": group_results, "fairness_conclusion": conclusion}
+
+
+def run_evaluation(manifest_path, output_path=DEFAULT_METRICS_PATH, cache_dir=DEFAULT_CACHE_DIR,
+                   thresholds=None, max_workers=None):
+    """
+    Evaluate a labelled corpus, reusing cached per-clip results
+
+    Clips go through AnalysisCache, keyed by clip SHA-256, detector version
+    and thresholds. After a change only clips whose key changed are re-run,
+    and a thresholds-only change replays cached observations without
+    decoding any video.
+
+    A clip counts as predicted drowsy if any frame reaches HIGH.
+
+    Args:
+        manifest_path: CSV manifest (see module docstring)
+        output_path: Metrics JSON read by ModelCard
+        cache_dir: Analysis cache directory
+        thresholds: Overrides for replay.DEFAULT_THRESHOLDS
+        max_workers: Process pool size
+
+    Returns:
+        dict: The metrics written to output_path plus run statistics
+    """
+    start = time.time()
+    effective = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    cache = AnalysisCache(cache_dir)
+
+    # Hash in the parent so only one process ever writes the hash index
+    rows = []
+    for clip in load_manifest(manifest_path):
+        rows.append(dict(clip, sha256=cache.hashes.get(clip["path"])))
+    cache.hashes.save()
+
+    pending = [r for r in rows if not cache.has_summary(r["sha256"], effective)]
+    cached = len(rows) - len(pending)
+
+    failed = []
+    print(f"🎬 Evaluating {len(pending)} of {len(rows)} clips ({cached} cached)")
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_analyze_clip, row["path"], row["sha256"], effective, cache_dir): row
+            for row in rows
+        }
+        for future in as_completed(futures):
+            row = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                print(f"❌ {row['path']}: {e}")
+                failed.append(row)
+                continue
+            row["predicted"] = int(summary["alert_distribution"]["HIGH"] > 0)
+            row["summary"] = summary
+
+    failed_ids = {id(r) for r in failed}
+    scored = [r for r in rows if id(r) not in failed_ids]
+    metrics = compute_metrics(scored)
+    metrics["evaluated_at"] = datetime.now().isoformat(timespec="seconds")
+    metrics["config_fingerprint"] = thresholds_fingerprint(effective)
+    metrics["thresholds"] = effective
+
+    tmp = output_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp, output_path)
+
+    metrics["run"] = {
+        "clips": len(rows),
+        "recomputed": sum(1 for r in pending if id(r) not in failed_ids),
+        "cached": cached,
+        "failed": len(failed),
+        "duration_seconds": round(time.time() - start, 1),
+    }
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate VigilDrive AI on a labelled clip corpus")
+    parser.add_argument("manifest", help="CSV manifest with path,label,group columns")
+    parser.add_argument("--output", default=DEFAULT_METRICS_PATH, help="Model card metrics file")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Analysis cache directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    metrics = run_evaluation(args.manifest, args.output, args.cache_dir, max_workers=args.workers)
+
+    overall = metrics["overall"]
+    run = metrics["run"]
+    print(f"\n✅ Evaluated {run['clips']} clips "
+          f"({run['recomputed']} recomputed, {run['cached']} cached, {run['failed']} failed) "
+          f"in {run['duration_seconds']}s")
+    print(f"   Accuracy: {overall['overall_accuracy']:.1%}  Precision: {overall['precision']:.1%}  "
+          f"Recall: {overall['recall']:.1%}  F1: {overall['f1_score']:.1%}")
+    for group in metrics["groups"]:
+        print(f"   {group['group']}: {group['accuracy']:.1%} (n={group['sample_size']}) {group['status']}")
+    print(f"   Metrics written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
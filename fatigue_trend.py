@@ -0,0 +1,149 @@
+"""
+VigilDrive AI - Fatigue Trend
+Online estimate of where PERCLOS and blink rate are heading
+
+Each analysed frame updates an EWMA level and an exponentially weighted
+least-squares slope per metric in O(1). Extrapolating the PERCLOS level
+along its slope gives the time until the HIGH threshold is reached, so an
+early warning can be issued before the threshold is actually crossed. It
+uses only metrics the detector has already computed - no extra CV work.
+"""
+
+import math
+
+
+# Slopes smaller than this (units per second) are treated as flat; they come
+# from floating-point noise, not from a trend
+MIN_SLOPE = 1e-9
+
+
+class StreamingTrend:
+    """EWMA level and exponentially weighted linear slope of one signal"""
+
+    def __init__(self, level_seconds=30.0, slope_seconds=120.0):
+        """
+        Args:
+            level_seconds: Time constant of the EWMA level
+            slope_seconds: Time constant of the weighted regression window
+        """
+        self.level_seconds = level_seconds
+        self.slope_seconds = slope_seconds
+        self.level = None
+        self.last_t = None
+        self.first_t = None
+        self._origin = 0.0
+        # Decayed regression sums over x = t - origin
+        self._w = self._x = self._y = self._xx = self._xy = 0.0
+
+    def update(self, t, y):
+        if self.last_t is None:
+            self.level = y
+            self.first_t = self._origin = t
+        else:
+            dt = max(t - self.last_t, 0.0)
+            self.level += (1.0 - math.exp(-dt / self.level_seconds)) * (y - self.level)
+            decay = math.exp(-dt / self.slope_seconds)
+            self._w *= decay
+            self._x *= decay
+            self._y *= decay
+            self._xx *= decay
+            self._xy *= decay
+        self.last_t = t
+
+        # Keep x small so the sums do not lose precision over long shifts
+        if t - self._origin > 10 * self.slope_seconds:
+            self._rebase(t)
+
+        x = t - self._origin
+        self._w += 1.0
+        self._x += x
+        self._y += y
+        self._xx += x * x
+        self._xy += x * y
+
+    def _rebase(self, origin):
+        d = origin - self._origin
+        self._xx += -2.0 * d * self._x + d * d * self._w
+        self._xy += -d * self._y
+        self._x += -d * self._w
+        self._origin = origin
+
+    @property
+    def slope(self):
+        """Units per second (0.0 until there are two distinct sample times)"""
+        denominator = self._w * self._xx - self._x * self._x
+        if denominator <= 1e-9:
+            return 0.0
+        return (self._w * self._xy - self._x * self._y) / denominator
+
+    def seconds_until(self, target, rising=True, horizon=None):
+        """
+        Time until the level reaches target at the current slope
+
+        Returns 0.0 if it is already there, and None if it is not heading
+        there, the slope is flat, or it would take longer than horizon seconds.
+        """
+        if self.level is None:
+            return None
+        if (self.level >= target) if rising else (self.level <= target):
+            return 0.0
+        slope = self.slope
+        if abs(slope) < MIN_SLOPE or ((slope < 0) if rising else (slope > 0)):
+            return None
+        seconds = (target - self.level) / slope
+        if horizon is not None and seconds > horizon:
+            return None
+        return seconds
+
+    def history_seconds(self):
+        return 0.0 if self.first_t is None else self.last_t - self.first_t
+
+
+class FatigueTrend:
+    """PERCLOS and blink-rate trends with a time-to-HIGH prediction"""
+
+    def __init__(self, perclos_threshold=0.2, min_blink_rate=10, warmup_seconds=60.0,
+                 level_seconds=30.0, slope_seconds=120.0, horizon_seconds=1800.0):
+        """
+        Args:
+            perclos_threshold: PERCLOS that means HIGH
+            min_blink_rate: Blink rate (per minute) below which MEDIUM applies
+            warmup_seconds: History needed before predictions are made
+            level_seconds: EWMA time constant
+            slope_seconds: Slope regression time constant
+            horizon_seconds: Longest prediction reported; a slope that needs
+                longer to reach a threshold is noise, not a trend
+        """
+        self.perclos_threshold = perclos_threshold
+        self.min_blink_rate = min_blink_rate
+        self.warmup_seconds = warmup_seconds
+        self.horizon_seconds = horizon_seconds
+        self.perclos = StreamingTrend(level_seconds, slope_seconds)
+        self.blink_rate = StreamingTrend(level_seconds, slope_seconds)
+
+    def update(self, now, perclos, blink_rate):
+        """
+        Add one analysed frame's metrics
+
+        Returns:
+            dict: EWMA levels, slopes per minute, and seconds_to_high /
+                seconds_to_low_blink_rate (None if not approaching within
+                horizon_seconds or still warming up)
+        """
+        self.perclos.update(now, perclos)
+        self.blink_rate.update(now, blink_rate)
+
+        ready = self.perclos.history_seconds() >= self.warmup_seconds
+        to_high = (self.perclos.seconds_until(self.perclos_threshold, horizon=self.horizon_seconds)
+                   if ready else None)
+        to_low_blink = (self.blink_rate.seconds_until(self.min_blink_rate, rising=False,
+                                                      horizon=self.horizon_seconds)
+                        if ready else None)
+        return {
+            "perclos_ewma": round(self.perclos.level, 4),
+            "perclos_slope_per_min": round(self.perclos.slope * 60, 4),
+            "blink_rate_ewma": round(self.blink_rate.level, 2),
+            "blink_rate_slope_per_min": round(self.blink_rate.slope * 60, 3),
+            "seconds_to_high": None if to_high is None else round(to_high, 1),
+            "seconds_to_low_blink_rate": None if to_low_blink is None else round(to_low_blink, 1),
+        }
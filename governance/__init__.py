@@ -0,0 +1,4 @@
+"""
+VigilDrive AI - Governance
+Privacy controls, audit logging and model transparency
+"""
@@ -0,0 +1,514 @@
+"""
+VigilDrive AI - Hash-Chained Audit Trail
+Append-only segmented log where every record carries the hash of its predecessor
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are serialised within one process only
+    fcntl = None
+
+
+GENESIS_HASH = "0" * 64
+CHECKPOINT_FILE = "checkpoints.log"
+LOCK_FILE = ".lock"
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def _canonical(payload):
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+def _record_hash(prev_hash, payload):
+    return hashlib.sha256((prev_hash + _canonical(payload)).encode("utf-8")).hexdigest()
+
+
+def _segment_name(index):
+    return f"segment-{index:06d}.log"
+
+
+class AuditChain:
+    """
+    Append-only audit trail split into fixed-size segments
+
+    Writes are group-committed: records reach the OS on every append but are
+    fsync'd in batches (every fsync_batch_size records or fsync_interval
+    seconds, whichever comes first). When a segment fills up a checkpoint is
+    written recording its start and end hashes, so segments can later be
+    verified independently and in parallel. The open segment is checkpointed
+    too, every checkpoint_every records or checkpoint_interval seconds, so
+    records cut from the tail are detected before the segment seals.
+
+    Use shared_chain() rather than constructing one per caller: the tail
+    hash lives in memory, so one directory needs one instance per process.
+    Appends also hold an exclusive lock on the directory and pick up
+    records other processes wrote since, so separate processes extend the
+    same chain instead of forking it.
+    """
+
+    def __init__(self, log_dir="audit_chain", segment_max_records=10000,
+                 fsync_batch_size=64, fsync_interval=0.2,
+                 checkpoint_every=500, checkpoint_interval=300.0):
+        """
+        Args:
+            log_dir: Directory holding segments and checkpoints
+            segment_max_records: Records per segment before rolling over
+            fsync_batch_size: Pending records that force an fsync
+            fsync_interval: Maximum seconds a record waits for its fsync
+            checkpoint_every: Records between checkpoints of the open segment
+            checkpoint_interval: Maximum seconds an appended record waits
+                for a checkpoint
+        """
+        self.log_dir = log_dir
+        self.segment_max_records = segment_max_records
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+
+        os.makedirs(log_dir, exist_ok=True)
+
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._written_seq = 0
+        self._synced_seq = 0
+        self._closed = False
+
+        self._lock_file = open(os.path.join(log_dir, LOCK_FILE), "ab")
+        with self._file_lock():
+            self._load_state()
+
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    # ------------------------------------------------------------------
+    # State recovery
+    # ------------------------------------------------------------------
+
+    def _load_state(self):
+        """
+        Resume from the newest segment
+
+        Only a final line without its newline (a write torn by a crash) is
+        discarded. Any other unreadable line is left in place - cutting it
+        would silently drop the records after it - and is listed in
+        recovery_errors; verify_chain reports it as a break.
+        """
+        self.recovery_errors = []
+        checkpoint_path = os.path.join(self.log_dir, CHECKPOINT_FILE)
+        self._checkpoint_bytes = os.path.getsize(checkpoint_path) if os.path.exists(checkpoint_path) else 0
+        self.checkpoints = read_checkpoints(self.log_dir)
+        self._last_checkpoint_hash = (
+            self.checkpoints[-1]["checkpoint_hash"] if self.checkpoints else GENESIS_HASH
+        )
+        self._checkpointed_seq = self.checkpoints[-1]["last_seq"] if self.checkpoints else 0
+        self._checkpointed_at = time.time()
+        sealed = [cp for cp in self.checkpoints if _is_sealed(cp)]
+
+        segments = sorted(f for f in os.listdir(self.log_dir) if f.startswith("segment-"))
+        if not segments:
+            self._open_segment(1, GENESIS_HASH, 0)
+            return
+
+        index = int(segments[-1][8:14])
+        path = os.path.join(self.log_dir, segments[-1])
+
+        if sealed and sealed[-1]["segment"] == index:
+            # Newest segment was sealed right before shutdown
+            last = sealed[-1]
+            self._open_segment(index + 1, last["end_hash"], last["last_seq"])
+            return
+
+        start_hash = sealed[-1]["end_hash"] if sealed else GENESIS_HASH
+        last_seq = sealed[-1]["last_seq"] if sealed else 0
+        first_seq = last_seq + 1
+        last_hash = start_hash
+        count = 0
+        valid_bytes = 0
+
+        with open(path, "rb") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.endswith(b"\n"):
+                    break
+                valid_bytes += len(line)
+                count += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.recovery_errors.append(f"{segments[-1]} line {line_no}: unreadable record")
+                    continue
+                if count == 1:
+                    first_seq = record["seq"]
+                last_seq = record["seq"]
+                last_hash = record["hash"]
+
+        if valid_bytes != os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+        for error in self.recovery_errors:
+            print(f"⚠️  Audit chain damaged, resuming after it: {error}")
+
+        self._segment_index = index
+        self._segment_start_hash = start_hash
+        self._segment_first_seq = first_seq
+        self._segment_count = count
+        self._seq = last_seq
+        self._last_hash = last_hash
+        self._written_seq = self._synced_seq = last_seq
+        self._file = open(path, "ab")
+        self._segment_bytes = valid_bytes
+
+    def _open_segment(self, index, start_hash, last_seq):
+        self._segment_index = index
+        self._segment_start_hash = start_hash
+        self._segment_first_seq = last_seq + 1
+        self._segment_count = 0
+        self._seq = last_seq
+        self._last_hash = start_hash
+        self._written_seq = self._synced_seq = last_seq
+        self._file = open(os.path.join(self.log_dir, _segment_name(index)), "ab")
+        self._segment_bytes = self._file.tell()
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Exclusive lock on the chain directory, shared with other processes
+
+        flock locks belong to the open file, not the thread, so within this
+        process it is only taken with self._cond held and never across a
+        self._cond.wait(); otherwise a second holder would silently share
+        it and its unlock would release it for both.
+        """
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _catch_up(self):
+        """Reload the tail if another process appended since our last write (lock held)"""
+        segment = os.path.join(self.log_dir, _segment_name(self._segment_index))
+        checkpoint_path = os.path.join(self.log_dir, CHECKPOINT_FILE)
+        checkpoint_bytes = os.path.getsize(checkpoint_path) if os.path.exists(checkpoint_path) else 0
+        if (os.path.getsize(segment) == self._segment_bytes
+                and checkpoint_bytes == self._checkpoint_bytes):
+            return
+        self._sync()
+        self._file.close()
+        self._load_state()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, action, user="System", details=None, wait_durable=False):
+        """
+        Append one record to the chain
+
+        Args:
+            action: Description of what happened
+            user: Role that performed the action
+            details: Optional JSON-serialisable extra data
+            wait_durable: Block until the record has been fsync'd
+
+        Returns:
+            dict: The stored record including its hash
+        """
+        with self._cond:
+            with self._file_lock():
+                if self._closed:
+                    raise RuntimeError("Audit chain is closed")
+                self._catch_up()
+
+                self._seq += 1
+                payload = {
+                    "seq": self._seq,
+                    "ts": time.time(),
+                    "action": action,
+                    "user": user,
+                    "details": details,
+                }
+                record_hash = _record_hash(self._last_hash, payload)
+                record = dict(payload, prev=self._last_hash, hash=record_hash)
+
+                line = (_canonical(record) + "\n").encode("utf-8")
+                self._file.write(line)
+                self._file.flush()
+                self._segment_bytes += len(line)
+                self._last_hash = record_hash
+                self._segment_count += 1
+                self._written_seq = self._seq
+                self._pending += 1
+
+                if self._segment_count >= self.segment_max_records:
+                    self._seal_segment()
+                elif self._checkpoint_due():
+                    self._checkpoint_tail()
+                elif self._pending >= self.fsync_batch_size:
+                    self._sync()
+                elif wait_durable:
+                    self._cond.notify_all()
+
+            # Wait only after the file lock is released: the flusher takes
+            # that lock on the same descriptor, and flock would let it in
+            # and then drop the lock for both of us
+            if wait_durable:
+                seq = self._seq
+                while self._synced_seq < seq:
+                    self._cond.wait()
+
+        return record
+
+    def _sync(self):
+        """fsync everything written so far (caller holds the lock)"""
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+            self._synced_seq = self._written_seq
+            self._cond.notify_all()
+
+    def _segment_checkpoint(self):
+        return {
+            "segment": self._segment_index,
+            "file": _segment_name(self._segment_index),
+            "first_seq": self._segment_first_seq,
+            "last_seq": self._seq,
+            "count": self._segment_count,
+            "start_hash": self._segment_start_hash,
+            "end_hash": self._last_hash,
+            "prev_checkpoint_hash": self._last_checkpoint_hash,
+        }
+
+    def _write_checkpoint(self, checkpoint):
+        """Chain a checkpoint onto the previous one and make it durable"""
+        checkpoint["checkpoint_hash"] = _record_hash(self._last_checkpoint_hash, checkpoint)
+
+        line = (_canonical(checkpoint) + "\n").encode("utf-8")
+        with open(os.path.join(self.log_dir, CHECKPOINT_FILE), "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._checkpoint_bytes += len(line)
+
+        self.checkpoints.append(checkpoint)
+        self._last_checkpoint_hash = checkpoint["checkpoint_hash"]
+        self._checkpointed_seq = checkpoint["last_seq"]
+        self._checkpointed_at = time.time()
+
+    def _seal_segment(self):
+        """Close the current segment, write its checkpoint and start the next one"""
+        self._sync()
+        self._file.close()
+        self._write_checkpoint(dict(self._segment_checkpoint(), sealed_at=time.time()))
+        self._open_segment(self._segment_index + 1, self._last_hash, self._seq)
+
+    def _checkpoint_due(self):
+        return self._seq > self._checkpointed_seq and (
+            self._seq - self._checkpointed_seq >= self.checkpoint_every
+            or time.time() - self._checkpointed_at >= self.checkpoint_interval)
+
+    def _checkpoint_tail(self):
+        """Checkpoint the open segment as it stands (caller holds both locks)"""
+        self._sync()
+        self._write_checkpoint(dict(self._segment_checkpoint(), sealed=False,
+                                    checkpointed_at=time.time()))
+
+    def _flush_loop(self):
+        """Background group commit: fsync pending records at least every fsync_interval"""
+        with self._cond:
+            while not self._closed:
+                self._cond.wait(self.fsync_interval)
+                if self._pending:
+                    self._sync()
+                if not self._closed and self._checkpoint_due():
+                    with self._file_lock():
+                        self._catch_up()
+                        if self._checkpoint_due():
+                            self._checkpoint_tail()
+
+    def flush(self):
+        """Force all pending records to disk"""
+        with self._cond:
+            self._sync()
+
+    def close(self):
+        with self._cond:
+            self._sync()
+            self._closed = True
+            self._file.close()
+            self._lock_file.close()
+            self._cond.notify_all()
+        self._flusher.join()
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    def verify(self, max_workers=None):
+        """Verify the whole chain; see verify_chain"""
+        self.flush()
+        return verify_chain(self.log_dir, max_workers=max_workers)
+
+
+def _is_sealed(checkpoint):
+    """Open-segment checkpoints carry sealed=False; older files only have sealed ones"""
+    return checkpoint.get("sealed", True)
+
+
+def shared_chain(log_dir="audit_chain", **kwargs):
+    """The process-wide AuditChain for log_dir, created on first use"""
+    key = os.path.realpath(log_dir)
+    with _shared_lock:
+        chain = _shared.get(key)
+        if chain is None or chain._closed:
+            chain = _shared[key] = AuditChain(log_dir, **kwargs)
+        return chain
+
+
+def read_checkpoints(log_dir):
+    """Load checkpoint records in order"""
+    path = os.path.join(log_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        return [json.loads(line) for line in f if line.endswith(b"\n")]
+
+
+def verify_segment(path, start_hash, expected_count=None, expected_end_hash=None, marks=None):
+    """
+    Re-hash one segment from its starting hash
+
+    Args:
+        marks: {seq: hash} from open-segment checkpoints that must be matched
+
+    Returns:
+        dict: {"file", "records", "end_hash", "errors"}
+    """
+    if not os.path.exists(path):
+        return {"file": os.path.basename(path), "records": 0,
+                "end_hash": expected_end_hash or start_hash, "errors": ["segment file is missing"]}
+
+    errors = []
+    prev_hash = start_hash
+    count = 0
+    marks = dict(marks or {})
+
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, start=1):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Reported once; checking carries on from the next record
+                errors.append(f"line {line_no}: unreadable record")
+                prev_hash = None
+                count += 1
+                continue
+
+            stored_hash = record.pop("hash", None)
+            stored_prev = record.pop("prev", None)
+            if prev_hash is not None and stored_prev != prev_hash:
+                errors.append(f"line {line_no}: broken link to previous record")
+            prev_hash = stored_prev if prev_hash is None else prev_hash
+            if _record_hash(prev_hash, record) != stored_hash:
+                errors.append(f"line {line_no}: record contents do not match hash")
+            if record.get("seq") in marks and marks.pop(record["seq"]) != stored_hash:
+                errors.append(f"line {line_no}: record does not match its checkpoint")
+
+            prev_hash = stored_hash
+            count += 1
+
+    if marks:
+        errors.append(f"records up to seq {max(marks)} were checkpointed but are missing")
+
+    if expected_count is not None and count != expected_count:
+        errors.append(f"expected {expected_count} records, found {count}")
+    if expected_end_hash is not None and prev_hash != expected_end_hash:
+        errors.append("final hash does not match checkpoint")
+
+    return {"file": os.path.basename(path), "records": count, "end_hash": prev_hash, "errors": errors}
+
+
+def verify_chain(log_dir, max_workers=None):
+    """
+    Verify an audit chain directory
+
+    The checkpoint chain is checked sequentially (a few records per
+    segment), then every sealed segment is re-hashed in parallel against its
+    checkpoint. Only the open tail segment depends on the previous one; it
+    is also held to its open-segment checkpoints. Missing segment files are
+    reported as errors.
+
+    Args:
+        log_dir: Directory written by AuditChain
+        max_workers: Process pool size (None lets the pool decide)
+
+    Returns:
+        dict: {"valid", "segments", "records", "errors"}
+    """
+    errors = []
+    checkpoints = read_checkpoints(log_dir)
+
+    prev_checkpoint_hash = GENESIS_HASH
+    prev_end_hash = GENESIS_HASH
+    marks = {}
+    for cp in checkpoints:
+        body = {k: v for k, v in cp.items() if k != "checkpoint_hash"}
+        if cp["prev_checkpoint_hash"] != prev_checkpoint_hash or \
+                _record_hash(prev_checkpoint_hash, body) != cp["checkpoint_hash"]:
+            errors.append(f"checkpoint for segment {cp['segment']} has been altered")
+        if cp["start_hash"] != prev_end_hash:
+            errors.append(f"segment {cp['segment']} does not continue segment {cp['segment'] - 1}")
+        prev_checkpoint_hash = cp["checkpoint_hash"]
+        if _is_sealed(cp):
+            prev_end_hash = cp["end_hash"]
+        else:
+            marks.setdefault(cp["file"], {})[cp["last_seq"]] = cp["end_hash"]
+
+    sealed_checkpoints = [cp for cp in checkpoints if _is_sealed(cp)]
+    sealed = {cp["file"] for cp in sealed_checkpoints}
+    tail = sorted(
+        {f for f in os.listdir(log_dir) if f.startswith("segment-")} | set(marks)
+    )
+    tail = [f for f in tail if f not in sealed]
+
+    jobs = [
+        (os.path.join(log_dir, cp["file"]), cp["start_hash"], cp["count"], cp["end_hash"],
+         marks.get(cp["file"]))
+        for cp in sealed_checkpoints
+    ]
+
+    results = []
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(verify_segment, *zip(*jobs)))
+    elif jobs:
+        results = [verify_segment(*jobs[0])]
+
+    # Unsealed segments continue from the last checkpoint, one after another
+    for name in tail:
+        result = verify_segment(os.path.join(log_dir, name), prev_end_hash, marks=marks.get(name))
+        prev_end_hash = result["end_hash"]
+        results.append(result)
+
+    for result in results:
+        errors.extend(f"{result['file']}: {e}" for e in result["errors"])
+
+    return {
+        "valid": not errors,
+        "segments": len(results),
+        "records": sum(r["records"] for r in results),
+        "errors": errors,
+    }
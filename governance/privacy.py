@@ -0,0 +1,407 @@
+"""
+VigilDrive AI - Privacy & Audit
+Privacy controls and the system audit log
+"""
+
+import csv
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import cv2
+
+from cascades import FACE_CASCADE, get_cascade
+from governance.audit_chain import shared_chain
+
+
+AUDIT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    action TEXT NOT NULL,
+    user TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log (ts);
+CREATE INDEX IF NOT EXISTS idx_audit_user_ts ON audit_log (user, ts);
+CREATE INDEX IF NOT EXISTS idx_audit_action_ts ON audit_log (action, ts);
+"""
+
+AUDIT_FIELDS = ["id", "timestamp", "action", "user", "details"]
+
+
+# Kernel size the fast engine actually runs at; larger strengths are reached
+# by shrinking the region first, so cost stays flat as strength grows
+FAST_BLUR_KERNEL = 9
+
+
+def fast_blur(roi, strength):
+    """
+    Approximate a Gaussian blur of kernel size `strength`
+
+    Small kernels are applied directly. Large ones downsample the region so
+    the equivalent kernel is ~FAST_BLUR_KERNEL pixels, blur that, and scale
+    back up - two resizes plus a small blur regardless of strength.
+    """
+    h, w = roi.shape[:2]
+    if strength <= FAST_BLUR_KERNEL or h < 2 or w < 2:
+        return cv2.GaussianBlur(roi, (strength, strength), 0)
+
+    factor = strength / FAST_BLUR_KERNEL
+    small_w = max(1, int(round(w / factor)))
+    small_h = max(1, int(round(h / factor)))
+
+    small = cv2.resize(roi, (small_w, small_h), interpolation=cv2.INTER_AREA)
+    small = cv2.GaussianBlur(small, (FAST_BLUR_KERNEL, FAST_BLUR_KERNEL), 0)
+    return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+
+
+class PrivacyManager:
+    """Face blurring for any footage that leaves the detector"""
+
+    def __init__(self, blur_enabled=True, blur_strength=51, blur_method="fast"):
+        """
+        Args:
+            blur_enabled: Blur faces in displayed footage
+            blur_strength: Gaussian kernel size (odd, 1-99)
+            blur_method: "fast" (downsample-blur-upsample) or "gaussian" (exact)
+        """
+        self.blur_enabled = blur_enabled
+        self.blur_strength = blur_strength
+        self.blur_method = blur_method
+        self._face_cascade = None
+
+    def toggle_blur(self):
+        self.blur_enabled = not self.blur_enabled
+        return self.blur_enabled
+
+    def set_blur_strength(self, strength):
+        """Set the kernel size, forcing it odd and within 1-99"""
+        strength = max(1, min(99, int(strength)))
+        self.blur_strength = strength if strength % 2 == 1 else strength + 1
+
+    def _detect_faces(self, frame):
+        """Fallback face pass for callers that have no detector output"""
+        if self._face_cascade is None:
+            self._face_cascade = get_cascade(FACE_CASCADE)
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return self._face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5,
+                                                   minSize=(100, 100))
+
+    def blur_faces(self, frame, faces=None):
+        """
+        Blur face regions in place
+
+        Args:
+            frame: OpenCV BGR or grayscale image (the display copy)
+            faces: Face boxes already found for this frame; when None a
+                separate face detection pass is run
+
+        Returns:
+            The blurred frame
+        """
+        if not self.blur_enabled:
+            return frame
+
+        if faces is None:
+            faces = self._detect_faces(frame)
+
+        k = self.blur_strength
+        frame_h, frame_w = frame.shape[:2]
+
+        # Only face regions are touched; the rest of the frame is never filtered
+        for (x, y, w, h) in faces:
+            x0, y0 = max(0, x), max(0, y)
+            x1, y1 = min(frame_w, x + w), min(frame_h, y + h)
+            if x1 <= x0 or y1 <= y0:
+                continue
+
+            roi = frame[y0:y1, x0:x1]
+            if self.blur_method == "fast":
+                frame[y0:y1, x0:x1] = fast_blur(roi, k)
+            else:
+                frame[y0:y1, x0:x1] = cv2.GaussianBlur(roi, (k, k), 0)
+
+        return frame
+
+
+def benchmark_blur(frame_size=(480, 640), face_size=200, strengths=None, repeats=30):
+    """
+    Time the blur methods at each strength level on a synthetic frame
+
+    Compares a full-frame Gaussian blur, an exact Gaussian on the face region
+    only, and the fast ROI engine.
+
+    Returns:
+        list: One dict per strength with per-frame times in milliseconds
+    """
+    import numpy as np
+
+    strengths = strengths or list(range(1, 100, 14))
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (frame_size[0], frame_size[1], 3), dtype=np.uint8)
+    faces = [((frame_size[1] - face_size) // 2, (frame_size[0] - face_size) // 2,
+              face_size, face_size)]
+
+    exact = PrivacyManager(blur_method="gaussian")
+    fast = PrivacyManager(blur_method="fast")
+
+    def time_ms(fn):
+        fn()  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        return (time.perf_counter() - start) * 1000 / repeats
+
+    results = []
+    for k in strengths:
+        exact.set_blur_strength(k)
+        fast.set_blur_strength(k)
+        k = exact.blur_strength
+
+        full_ms = time_ms(lambda: cv2.GaussianBlur(frame, (k, k), 0))
+        roi_ms = time_ms(lambda: exact.blur_faces(frame.copy(), faces))
+        fast_ms = time_ms(lambda: fast.blur_faces(frame.copy(), faces))
+
+        results.append({
+            "strength": k,
+            "full_frame_ms": round(full_ms, 3),
+            "roi_gaussian_ms": round(roi_ms, 3),
+            "roi_fast_ms": round(fast_ms, 3),
+            "speedup_vs_full_frame": round(full_ms / fast_ms, 1) if fast_ms > 0 else None,
+        })
+
+    return results
+
+
+class AuditLogger:
+    """
+    Persistent audit log with keyset paging
+
+    Entries are ordered by (ts, id). Pages are fetched with a cursor that
+    points at the last entry returned, so every page is an index range scan
+    regardless of how deep into the log it is.
+
+    Every action is also appended to a hash-chained AuditChain, which is the
+    tamper-evident record; the SQLite table is the queryable index over it.
+    """
+
+    def __init__(self, db_path="audit_log.db", chain_dir="audit_chain"):
+        """
+        Args:
+            db_path: SQLite database file for the audit log
+            chain_dir: Directory of the hash-chained audit trail (None disables it)
+        """
+        self.db_path = db_path
+        # One chain per directory per process: every session's logger must
+        # extend the same tail hash
+        self.chain = shared_chain(chain_dir) if chain_dir else None
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(AUDIT_SCHEMA)
+        self.conn.commit()
+
+    def log_action(self, action, user="System", details=None):
+        """
+        Record an action
+
+        Args:
+            action: Description of what happened
+            user: Role that performed the action
+            details: Optional JSON-serialisable extra data
+
+        Returns:
+            dict: The stored entry
+        """
+        if self.chain is not None:
+            record = self.chain.append(action, user=user, details=details)
+            now = record["ts"]
+        else:
+            now = time.time()
+
+        entry = {
+            "timestamp": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+            "action": action,
+            "user": user,
+            "details": json.dumps(details) if details is not None else None,
+        }
+
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO audit_log (ts, timestamp, action, user, details) VALUES (?, ?, ?, ?, ?)",
+                (now, entry["timestamp"], action, user, entry["details"]),
+            )
+        entry["id"] = cur.lastrowid
+        return entry
+
+    def verify_integrity(self, max_workers=None):
+        """
+        Check the hash chain for tampering
+
+        Returns:
+            dict: {"valid", "segments", "records", "errors"}
+        """
+        if self.chain is None:
+            return {"valid": False, "segments": 0, "records": 0,
+                    "errors": ["Hash-chained audit trail is disabled"]}
+        return self.chain.verify(max_workers=max_workers)
+
+    def _query_page(self, cursor, limit, start, end, user, action, newest_first):
+        """Fetch one page of raw rows; returns (rows, next_cursor)"""
+        clauses = []
+        params = []
+
+        if user is not None:
+            clauses.append("user = ?")
+            params.append(user)
+        if action is not None:
+            clauses.append("action = ?")
+            params.append(action)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_to_epoch(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(_to_epoch(end))
+        if cursor is not None:
+            cursor_ts, cursor_id = _decode_cursor(cursor)
+            clauses.append("(ts, id) < (?, ?)" if newest_first else "(ts, id) > (?, ?)")
+            params.extend([cursor_ts, cursor_id])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id, ts, timestamp, action, user, details FROM audit_log {where} "
+                f"ORDER BY ts {order}, id {order} LIMIT ?",
+                params + [limit],
+            ).fetchall()
+
+        next_cursor = _encode_cursor(rows[-1][1], rows[-1][0]) if len(rows) == limit else None
+        return rows, next_cursor
+
+    def get_logs_page(self, cursor=None, limit=50, start=None, end=None,
+                      user=None, action=None, newest_first=True):
+        """
+        Fetch one page of audit entries
+
+        Args:
+            cursor: Value of "next_cursor" from the previous page (None for the first page)
+            limit: Maximum entries per page
+            start: Only entries at or after this time (datetime or Unix time)
+            end: Only entries before this time (datetime or Unix time)
+            user: Only entries by this user
+            action: Only entries with this exact action
+            newest_first: Page backwards from the most recent entry
+
+        Returns:
+            dict: {"entries": [...], "next_cursor": str or None}
+        """
+        rows, next_cursor = self._query_page(cursor, limit, start, end, user, action, newest_first)
+        return {"entries": [_row_to_entry(r) for r in rows], "next_cursor": next_cursor}
+
+    def iter_logs(self, chunk_size=1000, start=None, end=None, user=None, action=None,
+                  newest_first=False):
+        """Yield entries one at a time, fetching chunk_size rows per query"""
+        cursor = None
+        while True:
+            rows, cursor = self._query_page(cursor, chunk_size, start, end, user, action, newest_first)
+            for row in rows:
+                yield _row_to_entry(row)
+            if cursor is None:
+                return
+
+    def get_recent_logs(self, limit=50):
+        """Return the most recent entries, newest first"""
+        return self.get_logs_page(limit=limit)["entries"]
+
+    def get_distinct_values(self, column, limit=200):
+        """
+        Return up to `limit` distinct users or actions in the log, sorted
+
+        A skip-scan over the column's index: each step seeks straight to the
+        next larger value, so the cost grows with the number of distinct
+        values (and only logarithmically with the log size) instead of
+        reading every index entry.
+        """
+        if column not in ("user", "action"):
+            raise ValueError(f"Unsupported column: {column}")
+        with self._lock:
+            rows = self.conn.execute(
+                f"""
+                WITH RECURSIVE distinct_values(value, n) AS (
+                    SELECT MIN({column}), 1 FROM audit_log
+                    UNION ALL
+                    SELECT (SELECT MIN({column}) FROM audit_log WHERE {column} > value), n + 1
+                    FROM distinct_values WHERE value IS NOT NULL AND n < ?
+                )
+                SELECT value FROM distinct_values WHERE value IS NOT NULL
+                """, (int(limit),)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def export_logs(self, path, fmt=None, chunk_size=1000, start=None, end=None,
+                    user=None, action=None):
+        """
+        Stream matching entries to a CSV or JSONL file in chronological order
+
+        Args:
+            path: Output file
+            fmt: "csv" or "jsonl" (inferred from the file extension if None)
+            chunk_size: Rows fetched and written per chunk
+            start, end, user, action: Same filters as get_logs_page
+
+        Returns:
+            bool: True if the export succeeded
+        """
+        fmt = fmt or ("jsonl" if str(path).endswith((".jsonl", ".ndjson")) else "csv")
+
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                if fmt == "csv":
+                    writer = csv.DictWriter(f, fieldnames=AUDIT_FIELDS, extrasaction="ignore")
+                    writer.writeheader()
+
+                cursor = None
+                while True:
+                    rows, cursor = self._query_page(cursor, chunk_size, start, end, user, action,
+                                                    newest_first=False)
+                    entries = [_row_to_entry(r) for r in rows]
+                    if fmt == "csv":
+                        writer.writerows(entries)
+                    else:
+                        f.writelines(json.dumps(e) + "\n" for e in entries)
+                    if cursor is None:
+                        break
+            return True
+        except (OSError, sqlite3.Error, ValueError) as e:
+            print(f"❌ Audit export failed: {e}")
+            return False
+
+
+def _row_to_entry(row):
+    return {
+        "id": row[0],
+        "timestamp": row[2],
+        "action": row[3],
+        "user": row[4],
+        "details": row[5],
+    }
+
+
+def _encode_cursor(ts, entry_id):
+    return f"{ts!r}:{entry_id}"
+
+
+def _decode_cursor(cursor):
+    ts, entry_id = cursor.rsplit(":", 1)
+    return float(ts), int(entry_id)
+
+
+def _to_epoch(value):
+    return value.timestamp() if isinstance(value, datetime) else float(value)
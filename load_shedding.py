@@ -0,0 +1,151 @@
+"""
+VigilDrive AI - Load Shedding
+Keeps the live pipeline real-time on CPU-constrained in-vehicle units
+
+The controller watches the processing time of fully analysed frames and
+the capture backlog. When the unit falls behind it steps down a ladder of
+degradations, cheapest loss first, and steps back up once there is
+headroom again:
+
+    0  full quality
+    1  drop the on-frame overlay
+    2  lower the preview rate
+    3  lower the face detection scale
+    4  reuse tracked face/eye results for longer (motion gate)
+    5  lower the analysis cadence
+
+Detection of closures is never switched off; the lowest rung still analyses
+a frame at least every cadence max_gap_seconds.
+"""
+
+import time
+
+
+LADDER = [
+    {"name": "full quality", "overlay": True, "preview_every": 1, "detection_scale": 1.0,
+     "max_reuse_frames": None, "min_interval_seconds": 0.0},
+    {"name": "overlay off", "overlay": False, "preview_every": 1, "detection_scale": 1.0,
+     "max_reuse_frames": None, "min_interval_seconds": 0.0},
+    {"name": "preview rate lowered", "overlay": False, "preview_every": 3, "detection_scale": 1.0,
+     "max_reuse_frames": None, "min_interval_seconds": 0.0},
+    {"name": "detection scale lowered", "overlay": False, "preview_every": 3, "detection_scale": 0.6,
+     "max_reuse_frames": None, "min_interval_seconds": 0.0},
+    {"name": "tracking interval raised", "overlay": False, "preview_every": 3, "detection_scale": 0.6,
+     "max_reuse_frames": 45, "min_interval_seconds": 0.0},
+    {"name": "cadence lowered", "overlay": False, "preview_every": 5, "detection_scale": 0.6,
+     "max_reuse_frames": 45, "min_interval_seconds": 0.1},
+]
+
+
+class LoadShedder:
+    """Steps a DrowsinessDetector up and down the degradation ladder"""
+
+    def __init__(self, detector, frame_budget_seconds=1 / 15, max_backlog=2, smoothing=0.2,
+                 overload_ratio=0.9, headroom_ratio=0.6, hold_seconds=2.0, on_transition=None):
+        """
+        Args:
+            detector: DrowsinessDetector whose settings are adjusted
+            frame_budget_seconds: Target processing time per frame
+            max_backlog: Frames waiting in the capture queue before shedding
+            smoothing: EWMA weight of the newest processing time
+            overload_ratio: Step down when smoothed time exceeds this share of the budget
+            headroom_ratio: Step up when smoothed time is below this share of the budget
+            hold_seconds: Minimum time between transitions, so each one can settle
+            on_transition: Optional callable(entry) for every level change,
+                e.g. to write it to the audit log
+        """
+        self.detector = detector
+        self.frame_budget_seconds = frame_budget_seconds
+        self.max_backlog = max_backlog
+        self.smoothing = smoothing
+        self.overload_ratio = overload_ratio
+        self.headroom_ratio = headroom_ratio
+        self.hold_seconds = hold_seconds
+        self.on_transition = on_transition
+
+        self._default_reuse = detector.motion_gate.max_reuse_frames if detector.motion_gate else None
+        self.level = 0
+        self.avg_seconds = None
+        self.last_change = None
+        self.transitions = []
+        self.frame_index = 0
+        self._apply(LADDER[0])
+
+    @property
+    def preview_every(self):
+        """Show only every Nth frame in the preview"""
+        return LADDER[self.level]["preview_every"]
+
+    def show_preview(self):
+        """Whether the current frame should be pushed to the preview"""
+        return self.frame_index % self.preview_every == 0
+
+    def _apply(self, settings):
+        detector = self.detector
+        detector.draw_overlay = settings["overlay"]
+        detector.detection_scale = settings["detection_scale"]
+        if detector.motion_gate is not None:
+            detector.motion_gate.max_reuse_frames = settings["max_reuse_frames"] or self._default_reuse
+        if detector.cadence is not None:
+            detector.cadence.min_interval_seconds = settings["min_interval_seconds"]
+
+    def record(self, processing_seconds, backlog=0, now=None, inference="full"):
+        """
+        Feed one frame's measurements and move along the ladder if needed
+
+        Args:
+            processing_seconds: Wall time spent on the frame
+            backlog: Frames queued behind it (capture buffer depth)
+            now: Current time (defaults to time.time())
+            inference: The result's "inference" field. Only "full" frames
+                update the average cost: frames that cadence or the motion
+                gate skipped cost almost nothing, and counting them would
+                show headroom at levels 4-5 that vanishes on stepping up.
+
+        Returns:
+            int: Current ladder level
+        """
+        now = time.time() if now is None else now
+        self.frame_index += 1
+
+        if inference == "full":
+            if self.avg_seconds is None:
+                self.avg_seconds = processing_seconds
+            else:
+                self.avg_seconds += self.smoothing * (processing_seconds - self.avg_seconds)
+        if self.avg_seconds is None:
+            return self.level
+
+        if self.last_change is not None and now - self.last_change < self.hold_seconds:
+            return self.level
+
+        overloaded = (self.avg_seconds > self.frame_budget_seconds * self.overload_ratio
+                      or backlog > self.max_backlog)
+        headroom = (self.avg_seconds < self.frame_budget_seconds * self.headroom_ratio
+                    and backlog == 0)
+
+        if overloaded and self.level < len(LADDER) - 1:
+            self._transition(self.level + 1, now, backlog)
+        elif headroom and self.level > 0:
+            self._transition(self.level - 1, now, backlog)
+        return self.level
+
+    def _transition(self, level, now, backlog):
+        entry = {
+            "ts": now,
+            "from_level": self.level,
+            "to_level": level,
+            "to": LADDER[level]["name"],
+            "avg_frame_ms": round(self.avg_seconds * 1000, 1),
+            "backlog": backlog,
+        }
+        arrow = "⬇️" if level > self.level else "⬆️"
+        print(f"{arrow}  Load shedding level {self.level} -> {level} ({entry['to']}), "
+              f"{entry['avg_frame_ms']} ms/frame, backlog {backlog}")
+
+        self.level = level
+        self.last_change = now
+        self._apply(LADDER[level])
+        self.transitions.append(entry)
+        if self.on_transition is not None:
+            self.on_transition(entry)
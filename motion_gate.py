@@ -0,0 +1,138 @@
+"""
+VigilDrive AI - Motion Gate
+Skips cascade inference on frames where nothing relevant has changed
+
+In a parked or steady cab consecutive frames are nearly identical, so the
+face result from the last detection can be reused until the face region
+moves. The eye band is still compared on every frame at full resolution, so
+a blink always triggers a fresh eye pass.
+"""
+
+import cv2
+
+
+class MotionGate:
+    """Frame-difference gate in front of the face and eye cascades"""
+
+    def __init__(self, scale=0.25, pixel_delta=20, face_change_fraction=0.05,
+                 eye_change_fraction=0.02, max_reuse_frames=15):
+        """
+        Args:
+            scale: Downscale factor for the face-region comparison
+            pixel_delta: Gray-level difference that counts a pixel as changed
+            face_change_fraction: Changed share of the (downscaled) face region
+                above which faces are detected again
+            eye_change_fraction: Changed share of the full-resolution eye band
+                above which eyes are detected again
+            max_reuse_frames: Consecutive reuses allowed before a forced refresh
+        """
+        self.scale = scale
+        self.pixel_delta = pixel_delta
+        self.face_change_fraction = face_change_fraction
+        self.eye_change_fraction = eye_change_fraction
+        self.max_reuse_frames = max_reuse_frames
+
+        self.frames = 0
+        self.face_runs = 0
+        self.eye_runs = 0
+        self.reset()
+
+    def reset(self):
+        """Drop the references so the next frame runs full detection"""
+        self._small = None
+        self._small_source = None
+        self._face_ref = None
+        self._faces = None
+        self._face_reuses = 0
+        self._eye_ref = None
+        self._eyes = None
+        self._eye_reuses = 0
+
+    def _changed_fraction(self, current, reference):
+        diff = cv2.absdiff(current, reference)
+        _, changed = cv2.threshold(diff, self.pixel_delta, 255, cv2.THRESH_BINARY)
+        return cv2.countNonZero(changed) / changed.size
+
+    def _face_region(self, shape):
+        """Union of the cached face boxes in downscaled coordinates (whole frame if none)"""
+        if not self._faces:
+            return slice(None), slice(None)
+        x0 = min(f[0] for f in self._faces)
+        y0 = min(f[1] for f in self._faces)
+        x1 = max(f[0] + f[2] for f in self._faces)
+        y1 = max(f[1] + f[3] for f in self._faces)
+        s = self.scale
+        return (slice(max(int(y0 * s), 0), min(int(y1 * s) + 1, shape[0])),
+                slice(max(int(x0 * s), 0), min(int(x1 * s) + 1, shape[1])))
+
+    def check_faces(self, gray):
+        """
+        Args:
+            gray: Full-resolution grayscale frame
+
+        Returns:
+            list: Cached face boxes if the face region is unchanged, else None
+        """
+        self.frames += 1
+        self._shrink(gray)
+
+        if (self._face_ref is None or self._face_ref.shape != self._small.shape
+                or self._face_reuses >= self.max_reuse_frames):
+            return None
+
+        rows, cols = self._face_region(self._small.shape)
+        if self._changed_fraction(self._small[rows, cols], self._face_ref[rows, cols]) > self.face_change_fraction:
+            return None
+
+        self._face_reuses += 1
+        return self._faces
+
+    def _shrink(self, gray):
+        self._small = cv2.resize(gray, None, fx=self.scale, fy=self.scale,
+                                 interpolation=cv2.INTER_AREA)
+        self._small_source = gray
+
+    def store_faces(self, faces, gray):
+        """Record a fresh face detection for this grayscale frame"""
+        if gray is not self._small_source:
+            self._shrink(gray)  # check_faces was bypassed for this frame
+        self.face_runs += 1
+        if faces != self._faces:
+            self._eye_ref = None  # the eye band moves with the face box
+        self._face_ref = self._small
+        self._faces = faces
+        self._face_reuses = 0
+
+    def check_eyes(self, roi_gray):
+        """
+        Args:
+            roi_gray: Eye band of the current face box at full resolution
+
+        Returns:
+            Cached eye result (as stored) if the band is unchanged, else None
+        """
+        if (self._eye_ref is None or self._eye_ref.shape != roi_gray.shape
+                or self._eye_reuses >= self.max_reuse_frames):
+            return None
+
+        if self._changed_fraction(roi_gray, self._eye_ref) > self.eye_change_fraction:
+            return None
+
+        self._eye_reuses += 1
+        return self._eyes
+
+    def store_eyes(self, roi_gray, eyes):
+        """Record a fresh eye result (e.g. a backend eye_state) for this eye band"""
+        self.eye_runs += 1
+        self._eye_ref = roi_gray.copy()
+        self._eyes = eyes
+        self._eye_reuses = 0
+
+    def stats(self):
+        """How often each cascade actually ran"""
+        return {
+            "frames": self.frames,
+            "face_runs": self.face_runs,
+            "eye_runs": self.eye_runs,
+            "face_skip_rate": round(1 - self.face_runs / self.frames, 3) if self.frames else 0.0,
+        }
@@ -0,0 +1,111 @@
+"""
+VigilDrive AI - Observation Log
+Compact binary record of what the detector saw on each frame (boxes, counts,
+brightness) with no pixel data, so scoring can be replayed after the fact
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+
+MAGIC = b"VDOBS\x01"
+
+# 35 bytes per frame: ~3.8 MB per hour at 30 FPS
+OBSERVATION_DTYPE = np.dtype([
+    ("ts", "<f8"),                # capture time (seconds)
+    ("face", "<i2", (4,)),        # largest face box x, y, w, h (zeros if none)
+    ("eyes", "<i2", (2, 4)),      # first two eye boxes in frame coordinates
+    ("face_count", "u1"),
+    ("eye_count", "u1"),
+    ("brightness", "u1"),         # mean gray level of the frame
+])
+
+
+class ObservationWriter:
+    """Buffered writer for observation logs"""
+
+    def __init__(self, path, metadata=None, buffer_frames=1024):
+        """
+        Args:
+            path: Output file
+            metadata: JSON-serialisable dict stored in the header
+            buffer_frames: Frames held in memory between writes
+        """
+        self.path = path
+        self.metadata = metadata or {}
+        self._buffer = np.zeros(buffer_frames, dtype=OBSERVATION_DTYPE)
+        self._count = 0
+        self.frames_written = 0
+
+        header = json.dumps(self.metadata).encode("utf-8")
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write(self, ts, face_box, eye_boxes, face_count, eye_count, brightness):
+        """
+        Append one frame
+
+        Args:
+            ts: Frame timestamp in seconds
+            face_box: (x, y, w, h) of the analysed face, or None
+            eye_boxes: Eye boxes in frame coordinates (only the first two are kept)
+            face_count: Number of faces found
+            eye_count: Number of eyes found
+            brightness: Mean gray level 0-255
+        """
+        rec = self._buffer[self._count]
+        rec["ts"] = ts
+        rec["face"] = face_box if face_box is not None else (0, 0, 0, 0)
+        rec["eyes"] = 0
+        for i, box in enumerate(eye_boxes[:2]):
+            rec["eyes"][i] = box
+        rec["face_count"] = min(face_count, 255)
+        rec["eye_count"] = min(eye_count, 255)
+        rec["brightness"] = min(max(int(brightness), 0), 255)
+
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._count:
+            self._file.write(self._buffer[:self._count].tobytes())
+            self.frames_written += self._count
+            self._count = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def read_observations(path, mmap=True):
+    """
+    Load an observation log
+
+    Args:
+        path: File written by ObservationWriter
+        mmap: Memory-map the records instead of reading them into RAM
+
+    Returns:
+        tuple: (metadata dict, structured array of OBSERVATION_DTYPE)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a VigilDrive observation log")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        metadata = json.loads(f.read(header_len).decode("utf-8"))
+
+    offset = len(MAGIC) + 4 + header_len
+    if os.path.getsize(path) == offset:
+        records = np.zeros(0, dtype=OBSERVATION_DTYPE)
+    elif mmap:
+        records = np.memmap(path, dtype=OBSERVATION_DTYPE, mode="r", offset=offset)
+    else:
+        records = np.fromfile(path, dtype=OBSERVATION_DTYPE, offset=offset)
+
+    return metadata, records
@@ -0,0 +1,312 @@
+"""
+VigilDrive AI - Replay Scoring Engine
+Recomputes PERCLOS, blink rate and alert levels from an observation log,
+vectorised with NumPy so whole shifts replay in milliseconds
+"""
+
+import time
+
+import numpy as np
+
+from observation_log import read_observations
+
+
+LEVELS = ("LOW", "MEDIUM", "HIGH")
+
+# Mirrors the constants used by DrowsinessDetector.detect_drowsiness
+DEFAULT_THRESHOLDS = {
+    "eyes_closed_threshold": 2.0,     # seconds -> HIGH
+    "perclos_threshold": 0.2,         # -> HIGH
+    "medium_closed_threshold": 1.0,   # seconds -> MEDIUM
+    "medium_perclos_threshold": 0.15,  # -> MEDIUM
+    "min_blink_rate": 10,             # blinks/min below this -> MEDIUM
+    "blink_max_duration": 0.4,        # closures shorter than this count as blinks
+}
+
+PERCLOS_WINDOW_SECONDS = 60.0
+BLINK_WINDOW_SECONDS = 60.0
+
+
+def _time_window_mean(values, ts, window):
+    """Mean of values over entries with timestamp in (ts[i] - window, ts[i]]"""
+    csum = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    lo = np.searchsorted(ts, ts - window, side="right")
+    hi = np.arange(1, len(values) + 1)
+    return (csum[hi] - csum[lo]) / (hi - lo)
+
+
+def _shift(values, fill, step=1):
+    """values delayed by `step` positions (negative = advanced), padded with fill"""
+    out = np.full_like(values, fill)
+    if step > 0:
+        out[step:] = values[:-step]
+    else:
+        out[:step] = values[-step:]
+    return out
+
+
+def compute_features(records, blink_max_duration=DEFAULT_THRESHOLDS["blink_max_duration"]):
+    """
+    Per-frame quantities the alert rules are evaluated on
+
+    Only the blink duration cut-off changes these; every other threshold is
+    applied afterwards, which is what makes threshold sweeps cheap.
+
+    Returns:
+        dict of arrays over face frames ("face_idx", "closed", "duration",
+        "blink", "blink_rate", "perclos") plus "n" and "face_detected"
+    """
+    n = len(records)
+
+    ts = np.asarray(records["ts"], dtype=np.float64)
+    face_detected = np.asarray(records["face_count"]) > 0
+
+    # The detector only updates its state on frames where a face was found,
+    # so everything below works on the face-frame subsequence
+    face_idx = np.flatnonzero(face_detected)
+    closed = np.asarray(records["eye_count"])[face_idx] < 2
+    face_ts = ts[face_idx]
+    m = len(face_idx)
+
+    # Closure duration: time since the first frame of the current closed run
+    positions = np.arange(m)
+    prev_closed = _shift(closed, False)
+    run_start = closed & ~prev_closed
+    start_pos = np.maximum.accumulate(np.where(run_start, positions, 0))
+    duration = np.where(closed, face_ts - face_ts[start_pos], 0.0)
+
+    # Blink: eyes reopen after a short run. The closure is logged as the
+    # event (start, start + duration) of the run's last closed frame and
+    # classified on end - start, exactly as blink_events.BlinkEventLog does
+    prev_start = _shift(face_ts[start_pos], 0.0)
+    prev_end = prev_start + _shift(duration, 0.0)
+    blink = ~closed & prev_closed & (prev_end - prev_start < blink_max_duration)
+
+    # Blink rate counts blinks that ended in the trailing BLINK_WINDOW_SECONDS,
+    # divided by that window or by the time since the first frame if shorter
+    blink_cum = np.cumsum(blink, dtype=np.int64)
+    expired = np.searchsorted(prev_end[blink], face_ts - BLINK_WINDOW_SECONDS, side="right")
+    elapsed = np.minimum(BLINK_WINDOW_SECONDS, face_ts - (ts[0] if n else 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        blink_rate = np.where(elapsed > 0, ((blink_cum - expired) / elapsed) * 60, 0).astype(np.int64)
+
+    return {
+        "n": n,
+        "face_detected": face_detected,
+        "face_idx": face_idx,
+        "closed": closed,
+        "duration": duration,
+        "blink": blink,
+        "blink_rate": blink_rate,
+        "perclos": _time_window_mean(closed, face_ts, PERCLOS_WINDOW_SECONDS),
+    }
+
+
+def _classify(features, t):
+    """Alert level per face frame; threshold values may be scalars or (K, 1) columns"""
+    duration = features["duration"]
+    perclos = features["perclos"]
+    high = (duration > t["eyes_closed_threshold"]) | (perclos > t["perclos_threshold"])
+    medium = ((duration > t["medium_closed_threshold"]) |
+              (perclos > t["medium_perclos_threshold"]) |
+              (features["blink_rate"] < t["min_blink_rate"]))
+    return np.where(high, 2, np.where(medium, 1, 0)).astype(np.int8)
+
+
+def replay_scores(records, thresholds=None):
+    """
+    Score every frame of an observation log exactly as the live detector would
+
+    Args:
+        records: Structured array from read_observations
+        thresholds: Overrides for DEFAULT_THRESHOLDS
+
+    Returns:
+        dict of per-frame arrays: "alert_level" (0=LOW, 1=MEDIUM, 2=HIGH),
+        "perclos", "blink_rate", "eye_closed_duration", "face_detected",
+        "eyes_closed", "blink"
+    """
+    t = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    features = compute_features(records, t["blink_max_duration"])
+    n, face_idx = features["n"], features["face_idx"]
+
+    def scatter(values, dtype):
+        out = np.zeros(n, dtype=dtype)
+        out[face_idx] = values
+        return out
+
+    return {
+        "alert_level": scatter(_classify(features, t), np.int8),
+        "perclos": scatter(features["perclos"], np.float64),
+        "blink_rate": scatter(features["blink_rate"], np.int64),
+        "eye_closed_duration": scatter(features["duration"], np.float64),
+        "face_detected": features["face_detected"],
+        "eyes_closed": scatter(features["closed"], bool),
+        "blink": scatter(features["blink"], bool),
+    }
+
+
+def grid_candidates(**ranges):
+    """
+    Cartesian product of threshold values
+
+    Example:
+        grid_candidates(perclos_threshold=[0.15, 0.2, 0.25], min_blink_rate=[6, 8, 10])
+
+    Returns:
+        list: One full threshold dict per combination
+    """
+    keys = list(ranges)
+    grids = np.meshgrid(*[np.asarray(ranges[k], dtype=np.float64) for k in keys], indexing="ij")
+    flat = [g.ravel() for g in grids]
+    return [
+        dict(DEFAULT_THRESHOLDS, **{k: float(col[i]) for k, col in zip(keys, flat)})
+        for i in range(len(flat[0]) if flat else 0)
+    ]
+
+
+def sweep_thresholds(corpus, candidates, alert_on="HIGH", chunk_size=128,
+                     return_timelines=False):
+    """
+    Evaluate many threshold sets against labelled recordings in one pass
+
+    Features are computed once per recording (and per distinct blink cut-off);
+    the alert rules for all candidates are then evaluated as (K, frames)
+    array comparisons, chunked over candidates to bound memory.
+
+    Args:
+        corpus: List of (records, labels) pairs; labels is a per-frame bool
+            array, True where the driver was actually drowsy
+        candidates: List of threshold dicts (missing keys use DEFAULT_THRESHOLDS)
+        alert_on: Lowest level that counts as an alert ("MEDIUM" or "HIGH")
+        chunk_size: Candidates evaluated per array operation
+        return_timelines: Also return the (K, frames) alert level matrix
+
+    Returns:
+        dict of per-candidate arrays:
+            "false_alerts" - alert episodes that start outside a drowsy episode
+            "misses"       - drowsy episodes with no alert frame
+            "alert_frames", "true_positive_frames", "false_positive_frames",
+            "false_negative_frames"
+        plus "drowsy_episodes" and optionally "timelines"
+    """
+    candidates = [dict(DEFAULT_THRESHOLDS, **c) for c in candidates]
+    k_total = len(candidates)
+    min_level = LEVELS.index(alert_on)
+
+    # Concatenate recordings, remembering where each starts so episodes never
+    # run across a boundary
+    labels = np.concatenate([np.asarray(lab, dtype=bool) for _, lab in corpus])
+    starts = np.zeros(len(labels), dtype=bool)
+    offset = 0
+    for records, lab in corpus:
+        if len(records) != len(lab):
+            raise ValueError("Each recording needs exactly one label per frame")
+        if len(lab):
+            starts[offset] = True
+        offset += len(lab)
+    n = len(labels)
+
+    prev_label = _shift(labels, False) & ~starts
+    ep_start = np.flatnonzero(labels & ~prev_label)
+    next_label = _shift(labels, False, -1) & ~_shift(starts, True, -1)
+    ep_end = np.flatnonzero(labels & ~next_label)
+
+    results = {key: np.zeros(k_total, dtype=np.int64) for key in (
+        "false_alerts", "misses", "alert_frames", "true_positive_frames",
+        "false_positive_frames", "false_negative_frames")}
+    timelines = np.zeros((k_total, n), dtype=np.int8) if return_timelines else None
+
+    # Candidates sharing a blink cut-off share features
+    by_blink = {}
+    for i, c in enumerate(candidates):
+        by_blink.setdefault(c["blink_max_duration"], []).append(i)
+
+    for blink_max, indices in by_blink.items():
+        face_idx_all = []
+        feats = {key: [] for key in ("duration", "perclos", "blink_rate")}
+        offset = 0
+        for records, _ in corpus:
+            f = compute_features(records, blink_max)
+            face_idx_all.append(f["face_idx"] + offset)
+            for key in feats:
+                feats[key].append(f[key])
+            offset += f["n"]
+        face_idx = np.concatenate(face_idx_all)
+        features = {key: np.concatenate(v) for key, v in feats.items()}
+
+        for c0 in range(0, len(indices), chunk_size):
+            chunk = indices[c0:c0 + chunk_size]
+            t = {key: np.array([candidates[i][key] for i in chunk], dtype=np.float64)[:, None]
+                 for key in DEFAULT_THRESHOLDS}
+
+            level = np.zeros((len(chunk), n), dtype=np.int8)
+            level[:, face_idx] = _classify(features, t)
+            alert = level >= min_level
+
+            prev_alert = np.zeros_like(alert)
+            prev_alert[:, 1:] = alert[:, :-1]
+            prev_alert[:, starts] = False
+            onsets = alert & ~prev_alert
+
+            alert_cum = np.cumsum(alert, axis=1, dtype=np.int64)
+            before = np.where(ep_start > 0, alert_cum[:, np.maximum(ep_start - 1, 0)], 0)
+            hits = alert_cum[:, ep_end] - before
+
+            chunk = np.asarray(chunk)
+            results["false_alerts"][chunk] = (onsets & ~labels).sum(axis=1)
+            results["misses"][chunk] = (hits == 0).sum(axis=1)
+            results["alert_frames"][chunk] = alert.sum(axis=1)
+            results["true_positive_frames"][chunk] = (alert & labels).sum(axis=1)
+            results["false_positive_frames"][chunk] = (alert & ~labels).sum(axis=1)
+            results["false_negative_frames"][chunk] = (~alert & labels).sum(axis=1)
+            if timelines is not None:
+                timelines[chunk] = level
+
+    results["drowsy_episodes"] = len(ep_start)
+    if timelines is not None:
+        results["timelines"] = timelines
+    return results
+
+
+def summarize_scores(scores):
+    """Condense per-frame replay output into a shift summary"""
+    n = len(scores["alert_level"])
+    counts = np.bincount(scores["alert_level"], minlength=3) if n else np.zeros(3, int)
+
+    return {
+        "frames": n,
+        "alert_distribution": {level: int(c) for level, c in zip(LEVELS, counts)},
+        "max_perclos": round(float(scores["perclos"].max()), 3) if n else 0.0,
+        "max_eye_closed_duration": round(float(scores["eye_closed_duration"].max()), 2) if n else 0.0,
+        "blinks": int(scores["blink"].sum()),
+        "detection_rate": round(float(scores["face_detected"].mean()) * 100, 1) if n else 0.0,
+    }
+
+
+def replay_file(path, thresholds=None):
+    """
+    Replay a recorded observation log
+
+    Returns:
+        tuple: (summary dict, per-frame scores, frames scored per second)
+    """
+    _, records = read_observations(path)
+    start = time.perf_counter()
+    scores = replay_scores(records, thresholds)
+    elapsed = time.perf_counter() - start
+    fps = len(records) / elapsed if elapsed > 0 else float("inf")
+    return summarize_scores(scores), scores, fps
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python replay.py <observation_log>")
+        sys.exit(1)
+
+    summary, _, fps = replay_file(sys.argv[1])
+    print(f"🔁 Replayed {summary['frames']:,} frames at {fps:,.0f} frames/s")
+    for key, value in summary.items():
+        print(f"   {key}: {value}")
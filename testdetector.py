@@ -3,22 +3,27 @@ Test script for drowsiness detector
 Tests different scenarios and generates demo data
 """
 
+import os
 import cv2
 import numpy as np
 from detector import DrowsinessDetector
+from analysis_cache import AnalysisCache
+from camera_discovery import open_camera
 import time
 
 def test_with_webcam():
     """Test with live webcam - same as main detector test"""
     print("🎥 Testing with webcam...")
-    detector = DrowsinessDetector()
-    cap = cv2.VideoCapture(0)
+    detector = DrowsinessDetector(motion_gate=True)
+    # Same camera the app uses: the cached one, probing only if it is gone
+    cap, camera = open_camera()
     
-    if not cap.isOpened():
+    if cap is None or not cap.isOpened():
         print("❌ Cannot open webcam")
         return
     
-    print("✅ Webcam ready. Press 'q' to quit")
+    print(f"✅ Webcam {camera['device']} ready ({camera['backend_name']}, "
+          f"opened in {camera['open_ms']:.0f} ms). Press 'q' to quit")
     print("📋 Test checklist:")
     print("   1. Normal state (should show LOW)")
     print("   2. Close eyes for 2+ seconds (should show HIGH)")
@@ -65,38 +70,45 @@ def test_with_webcam():
             print(f"{key}: {value}")
 
 
-def test_with_video_file(video_path):
-    """Test with pre-recorded video file"""
+def test_with_video_file(video_path, stride=1):
+    """Test with pre-recorded video file (results are cached by file content)"""
     print(f"🎬 Testing with video file: {video_path}")
-    detector = DrowsinessDetector()
-    cap = cv2.VideoCapture(video_path)
     
-    if not cap.isOpened():
+    if not os.path.exists(video_path):
         print(f"❌ Cannot open video: {video_path}")
         return
     
-    frame_count = 0
-    alerts = {"LOW": 0, "MEDIUM": 0, "HIGH": 0}
-    
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        frame_count += 1
-        result = detector.detect_drowsiness(frame)
-        alerts[result["alert_level"]] += 1
-        
+    def preview(frame_count, result):
         # Show every 30th frame to speed up
         if frame_count % 30 == 0:
             cv2.imshow('Video Test', result["frame"])
             if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+                return False
     
-    cap.release()
+    start_time = time.time()
+    try:
+        summary = AnalysisCache().analyze(video_path, on_frame=preview, stride=stride)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return
     cv2.destroyAllWindows()
     
-    print(f"\n✅ Processed {frame_count} frames")
+    cache_notes = {
+        "hit": "⚡ Loaded cached analysis",
+        "rescored": "⚡ Re-scored cached observations (thresholds changed)",
+        "partial": "⚠️  Stopped early - partial result not cached",
+    }
+    if summary["cache"] in cache_notes:
+        print(cache_notes[summary["cache"]])
+    
+    frame_count = summary["frames"]
+    alerts = summary["alert_distribution"]
+    if frame_count == 0:
+        print("❌ No frames decoded")
+        return
+    
+    print(f"\n✅ Processed {frame_count} of {summary['source_frames']} frames "
+          f"(stride {stride}) in {time.time() - start_time:.2f}s")
     print(f"Alert Distribution:")
     print(f"   LOW: {alerts['LOW']} frames ({alerts['LOW']/frame_count*100:.1f}%)")
     print(f"   MEDIUM: {alerts['MEDIUM']} frames ({alerts['MEDIUM']/frame_count*100:.1f}%)")
@@ -153,9 +165,9 @@ def integration_test():
     from detector import get_drowsiness_data
     
     detector = DrowsinessDetector()
-    cap = cv2.VideoCapture(0)
+    cap, _ = open_camera()
     
-    if not cap.isOpened():
+    if cap is None or not cap.isOpened():
         print("❌ Cannot open webcam")
         return
     
@@ -180,6 +192,113 @@ def integration_test():
     print("\n✅ Integration test complete!")
 
 
+def benchmark_privacy_blur():
+    """Compare face blur methods at every Blur Intensity level"""
+    print("🔬 Benchmarking privacy blur (640x480 frame, 200x200 face)...")
+    
+    from governance.privacy import benchmark_blur
+    
+    print(f"\n{'Strength':>8} {'Full frame':>12} {'ROI Gaussian':>14} {'ROI fast':>10} {'Speedup':>9}")
+    for row in benchmark_blur():
+        print(f"{row['strength']:>8} {row['full_frame_ms']:>10.2f}ms {row['roi_gaussian_ms']:>12.2f}ms "
+              f"{row['roi_fast_ms']:>8.2f}ms {row['speedup_vs_full_frame']:>8}x")
+
+
+def _ask_stride():
+    """Prompt until the stride is a whole number of at least 1"""
+    while True:
+        stride = input("Analyse every Nth frame [1]: ").strip()
+        if not stride:
+            return 1
+        if stride.isdigit() and int(stride) >= 1:
+            return int(stride)
+        print("❌ Enter a whole number of 1 or more")
+
+
+def benchmark_decode_stride(video_path):
+    """Show how much decoding grab() saves when only every Nth frame is analysed"""
+    print(f"🔬 Benchmarking decode stride on {video_path}...")
+    
+    if not os.path.exists(video_path):
+        print(f"❌ Cannot open video: {video_path}")
+        return
+    
+    from analysis_cache import benchmark_decode
+    
+    print(f"\n{'Stride':>6} {'Analysed':>9} {'read()':>10} {'grab()':>10} {'Speedup':>8} {'Analysis':>10} {'Video fps':>10}")
+    for row in benchmark_decode(video_path):
+        print(f"{row['stride']:>6} {row['analysed_frames']:>9} {row['read_ms']:>8.0f}ms {row['grab_ms']:>8.0f}ms "
+              f"{row['decode_speedup']:>7}x {row['analysis_ms']:>8.0f}ms {row['source_fps']:>10}")
+
+
+def benchmark_detector_backends(video_path, labels_path=None):
+    """Compare CPU cost, FPS and closure accuracy of every available backend"""
+    print(f"🔬 Benchmarking detector backends on {video_path}...")
+    
+    if not os.path.exists(video_path):
+        print(f"❌ Cannot open video: {video_path}")
+        return
+    
+    from backends import benchmark_backends
+    
+    rows = benchmark_backends(video_path, closed_labels=labels_path or None)
+    print(f"\n{'Backend':>10} {'CPU/frame':>10} {'FPS':>8} {'Face rate':>10} {'Closure acc.':>13}")
+    for row in rows:
+        accuracy = "-" if row["closure_accuracy"] is None else f"{row['closure_accuracy']:.1%}"
+        print(f"{row['backend']:>10} {row['cpu_ms_per_frame']:>8.2f}ms {row['fps']:>8} "
+              f"{row['face_rate']:>10.1%} {accuracy:>13}")
+    if rows:
+        print(f"\nClosure accuracy basis: {rows[0]['accuracy_basis']}")
+
+
+def _run_for_blinks(video_path, **detector_options):
+    """Blink events and CPU time for one detector configuration over a clip"""
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    detector = DrowsinessDetector(**detector_options)
+    detector.draw_overlay = False
+    
+    events = []
+    frame_index = 0
+    cpu_start = time.process_time()
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        result = detector.detect_drowsiness(frame, timestamp=frame_index / fps)
+        if result["closure_event"] is not None:
+            events.append(result["closure_event"])
+        frame_index += 1
+    cpu_seconds = time.process_time() - cpu_start
+    cap.release()
+    detector.close()
+    return events, cpu_seconds, frame_index
+
+
+def validate_dual_rate(video_path, face_rate_hz=8):
+    """Check blink accuracy of the dual-rate pipeline against the every-frame path"""
+    print(f"🔬 Validating dual-rate pipeline ({face_rate_hz} Hz faces) on {video_path}...")
+    
+    if not os.path.exists(video_path):
+        print(f"❌ Cannot open video: {video_path}")
+        return
+    
+    from blink_events import compare_blinks
+    
+    reference, reference_cpu, frames = _run_for_blinks(video_path)
+    candidate, candidate_cpu, _ = _run_for_blinks(video_path, face_rate_hz=face_rate_hz)
+    if frames == 0:
+        print("❌ No frames decoded")
+        return
+    
+    comparison = compare_blinks(reference, candidate)
+    print(f"\n{'Pipeline':>12} {'CPU/frame':>10} {'Blinks':>7}")
+    print(f"{'every-frame':>12} {reference_cpu * 1000 / frames:>8.2f}ms {comparison['reference_blinks']:>7}")
+    print(f"{'dual-rate':>12} {candidate_cpu * 1000 / frames:>8.2f}ms {comparison['candidate_blinks']:>7}")
+    print(f"\nBlink recall: {comparison['recall']:.1%}  precision: {comparison['precision']:.1%}  "
+          f"mean duration error: {comparison['mean_duration_error'] * 1000:.0f} ms")
+
+
 if __name__ == "__main__":
     print("="*60)
     print("  VigilDrive AI - Detector Testing Suite")
@@ -191,19 +310,35 @@ if __name__ == "__main__":
     print("2. Test with video file")
     print("3. Generate demo scenarios")
     print("4. Test integration with Person B")
+    print("5. Benchmark privacy blur")
+    print("6. Benchmark decode stride (video file)")
+    print("7. Compare detector backends (video file)")
+    print("8. Validate dual-rate pipeline (video file)")
     print()
     
-    choice = input("Enter choice (1-4): ")
+    choice = input("Enter choice (1-8): ")
     
     if choice == "1":
         test_with_webcam()
     elif choice == "2":
         video_path = input("Enter video file path: ")
-        test_with_video_file(video_path)
+        test_with_video_file(video_path, _ask_stride())
     elif choice == "3":
         generate_demo_scenarios()
     elif choice == "4":
         integration_test()
+    elif choice == "5":
+        benchmark_privacy_blur()
+    elif choice == "6":
+        video_path = input("Enter video file path: ")
+        benchmark_decode_stride(video_path)
+    elif choice == "7":
+        video_path = input("Enter video file path: ")
+        labels_path = input("Per-frame closure labels file (optional): ").strip()
+        benchmark_detector_backends(video_path, labels_path)
+    elif choice == "8":
+        video_path = input("Enter video file path: ")
+        validate_dual_rate(video_path)
     else:
         print("Invalid choice. Running webcam test by default...")
         test_with_webcam()
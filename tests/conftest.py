@@ -0,0 +1,67 @@
+"""Shared fixtures: a scripted backend so detector logic runs without a camera"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+FACE = (80, 40, 160, 160)
+OPEN_EYES = [(20, 20, 30, 20), (100, 20, 30, 20)]
+
+
+class ScriptedBackend:
+    """Backend whose face and eye state come from callables of the frame time"""
+
+    name = "scripted"
+
+    def __init__(self, eyes_closed, face_present=lambda t: True):
+        self.eyes_closed = eyes_closed
+        self.face_present = face_present
+        self.now = None
+
+    def locate_faces(self, gray, scale=1.0):
+        return [FACE] if self.face_present(self.now) else []
+
+    def eye_state(self, gray, face_box):
+        return {"eyes": [] if self.eyes_closed(self.now) else list(OPEN_EYES),
+                "ear": None, "mar": None}
+
+    def close(self):
+        pass
+
+
+def steady_blinks(per_minute=15, blink_seconds=0.2):
+    """Eyes closed for blink_seconds at the start of every blink period"""
+    period = 60.0 / per_minute
+    return lambda t: t % period < blink_seconds
+
+
+def drive(detector, seconds, fps=30.0, start=1000.0):
+    """Feed the detector blank frames at fps; yields (time, result)"""
+    frame = np.zeros((240, 320), dtype=np.uint8)
+    for i in range(int(seconds * fps)):
+        t = start + i / fps
+        detector.backend.now = t - start
+        yield t, detector.detect_drowsiness(frame, timestamp=t)
+
+
+@pytest.fixture
+def make_detector():
+    """DrowsinessDetector factory over a ScriptedBackend, without overlays"""
+    from detector import DrowsinessDetector
+
+    created = []
+
+    def make(eyes_closed=steady_blinks(), face_present=lambda t: True, **kwargs):
+        detector = DrowsinessDetector(backend=ScriptedBackend(eyes_closed, face_present), **kwargs)
+        detector.draw_overlay = False
+        created.append(detector)
+        return detector
+
+    yield make
+    for detector in created:
+        detector.close()
@@ -0,0 +1,70 @@
+"""Hash-chained audit trail under concurrent writers"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from governance.audit_chain import LOCK_FILE, AuditChain, verify_chain
+
+THREADS = 4
+RECORDS = 40
+
+fcntl = pytest.importorskip("fcntl")
+
+
+class SlowSyncChain(AuditChain):
+    """fsync that takes a while, so a durable append is caught waiting for it"""
+
+    def _sync(self):
+        if self._pending:
+            time.sleep(0.3)
+        super()._sync()
+
+
+def _write_records(log_dir, writer):
+    """Several threads appending with wait_durable while the flusher checkpoints"""
+    chain = AuditChain(log_dir, segment_max_records=50, fsync_interval=0.005,
+                       checkpoint_every=1000, checkpoint_interval=0.01)
+
+    def work(thread):
+        for i in range(RECORDS):
+            chain.append("Test append", user=f"{writer}-{thread}", details={"i": i},
+                         wait_durable=i % 2 == 0)
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    chain.close()
+
+
+def test_durable_wait_does_not_hold_directory_lock(tmp_path):
+    log_dir = str(tmp_path / "chain")
+    chain = SlowSyncChain(log_dir, fsync_interval=10.0)
+    writer = threading.Thread(target=chain.append, args=("Test append",),
+                              kwargs={"wait_durable": True})
+    writer.start()
+    time.sleep(0.1)
+
+    # A separate open of the lock file, as another process would have
+    with open(os.path.join(log_dir, LOCK_FILE), "ab") as other:
+        fcntl.flock(other.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(other.fileno(), fcntl.LOCK_UN)
+
+    writer.join()
+    chain.close()
+    assert verify_chain(log_dir)["records"] == 1
+
+
+def test_durable_appends_from_threads_and_processes(tmp_path):
+    log_dir = str(tmp_path / "chain")
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        list(pool.map(_write_records, [log_dir] * 3, range(3)))
+
+    result = verify_chain(log_dir, max_workers=2)
+    assert result["errors"] == []
+    assert result["records"] == 3 * THREADS * RECORDS
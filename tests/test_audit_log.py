@@ -0,0 +1,15 @@
+"""Audit log queries"""
+
+from governance.privacy import AuditLogger
+
+
+def test_distinct_values_are_sorted_and_limited(tmp_path):
+    logger = AuditLogger(str(tmp_path / "audit.db"), chain_dir=None)
+    assert logger.get_distinct_values("user") == []
+
+    for i in range(60):
+        logger.log_action(f"Action {i % 7}", user=("Driver", "Admin", "System")[i % 3])
+
+    assert logger.get_distinct_values("user") == ["Admin", "Driver", "System"]
+    assert logger.get_distinct_values("action") == [f"Action {i}" for i in range(7)]
+    assert logger.get_distinct_values("action", limit=2) == ["Action 0", "Action 1"]
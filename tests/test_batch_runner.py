@@ -0,0 +1,39 @@
+"""Batch manifest: finished files are only skipped for the same analysis"""
+
+import os
+
+from batch_runner import BatchManifest, analysis_params
+
+
+def test_done_entry_requires_matching_params(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(bytes(64))
+    stat = os.stat(video)
+
+    manifest = BatchManifest(str(tmp_path / "manifest.jsonl"))
+    manifest.record(dict(analysis_params(stride=1), path="clip.mp4", status="done",
+                         size=stat.st_size, mtime=stat.st_mtime))
+    manifest.close()
+
+    reopened = BatchManifest(str(tmp_path / "manifest.jsonl"))
+    try:
+        assert reopened.is_done("clip.mp4", stat, analysis_params(stride=1))
+        assert not reopened.is_done("clip.mp4", stat, analysis_params(stride=2))
+        assert not reopened.is_done("clip.mp4", stat,
+                                    analysis_params(stride=1, thresholds={"perclos_threshold": 0.3}))
+    finally:
+        reopened.close()
+
+
+def test_entries_without_params_are_redone(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(bytes(64))
+    stat = os.stat(video)
+
+    manifest = BatchManifest(str(tmp_path / "manifest.jsonl"))
+    try:
+        manifest.record({"path": "clip.mp4", "status": "done",
+                         "size": stat.st_size, "mtime": stat.st_mtime})
+        assert not manifest.is_done("clip.mp4", stat, analysis_params())
+    finally:
+        manifest.close()
@@ -0,0 +1,28 @@
+"""Blink rate must hold steady over a long drive, live and in replay"""
+
+from conftest import drive, steady_blinks
+from observation_log import read_observations
+from replay import replay_scores
+
+
+def test_steady_blink_rate_over_ten_minutes(make_detector):
+    detector = make_detector(steady_blinks(per_minute=15))
+
+    rates, levels = [], set()
+    for t, result in drive(detector, 600):
+        if t - 1000.0 >= 60.0:
+            rates.append(result["metrics"]["blink_rate"])
+            levels.add(result["alert_level"])
+
+    assert min(rates) >= 14 and max(rates) <= 16
+    assert levels == {"LOW"}
+
+
+def test_replay_matches_live_blink_rate(make_detector, tmp_path):
+    path = str(tmp_path / "drive.obs")
+    detector = make_detector(steady_blinks(per_minute=12), observation_log=path)
+    live = [result["metrics"]["blink_rate"] for _, result in drive(detector, 300)]
+    detector.close()
+
+    _, records = read_observations(path)
+    assert list(replay_scores(records)["blink_rate"]) == live
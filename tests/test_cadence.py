@@ -0,0 +1,31 @@
+"""Adaptive cadence end to end: a normally blinking driver gets skipped frames"""
+
+from conftest import drive, steady_blinks
+
+
+def test_frames_are_skipped_after_stable_period(make_detector):
+    detector = make_detector(steady_blinks(per_minute=15), cadence=True)
+    stable_seconds = detector.cadence.stable_seconds
+
+    early, late, levels = [], [], set()
+    for t, result in drive(detector, stable_seconds + 120):
+        elapsed = t - 1000.0
+        if elapsed < stable_seconds:
+            early.append(result["inference"])
+        elif elapsed > stable_seconds + 10:
+            late.append(result["inference"])
+            levels.add(result["alert_level"])
+
+    assert "skipped" not in early
+    assert late.count("skipped") > len(late) / 3
+    assert levels == {"LOW"}
+    assert result["metrics"]["blink_rate"] >= 14
+
+
+def test_non_low_result_restores_full_rate(make_detector):
+    detector = make_detector(lambda t: t > 200.0, cadence=True)
+    results = [result for t, result in drive(detector, 205)]
+
+    assert results[-1]["alert_level"] != "LOW"
+    assert detector.cadence.interval == 0.0
+    assert all(r["inference"] != "skipped" for r in results[-30:])
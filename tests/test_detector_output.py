@@ -0,0 +1,62 @@
+"""Every detector path returns the same result schema"""
+
+from conftest import drive, steady_blinks
+
+KEYS = {"alert_level", "confidence", "metrics", "timings", "closure_event", "trend",
+        "timestamp", "faces", "backend", "inference", "frame"}
+METRIC_KEYS = {"eye_closed_duration", "blink_rate", "perclos", "yawn_count",
+               "eyes_detected", "face_detected", "ear"}
+
+
+def _check_schema(result):
+    assert set(result) == KEYS
+    assert set(result["metrics"]) == METRIC_KEYS
+    assert set(result["timings"]) == {"yawn_ms"}
+
+
+def test_analysed_frames(make_detector):
+    detector = make_detector(steady_blinks(per_minute=15))
+    results = [result for _, result in drive(detector, 10)]
+
+    for result in results:
+        _check_schema(result)
+        assert result["inference"] == "full"
+    assert sum(r["closure_event"] is not None for r in results) == 3
+
+
+def test_frames_without_face(make_detector):
+    detector = make_detector(face_present=lambda t: False)
+    for _, result in drive(detector, 1):
+        _check_schema(result)
+        assert result["metrics"]["face_detected"] is False
+        assert result["closure_event"] is None
+
+
+def test_repeated_frames_do_not_repeat_closures(make_detector):
+    detector = make_detector(steady_blinks(per_minute=15), cadence=True)
+    detector.cadence.stable_seconds = 5.0
+
+    skipped = []
+    analysed_closures = 0
+    for _, result in drive(detector, 60):
+        _check_schema(result)
+        if result["inference"] == "skipped":
+            skipped.append(result)
+        elif result["closure_event"] is not None:
+            analysed_closures += 1
+
+    assert skipped
+    assert all(r["closure_event"] is None for r in skipped)
+    assert all(r["timings"]["yawn_ms"] == 0.0 for r in skipped)
+    assert analysed_closures == len(list(detector.blink_events.events()))
+
+
+def test_low_power_scan_frames(make_detector):
+    detector = make_detector(face_present=lambda t: False, presence=True)
+    results = [result for _, result in drive(detector, 5)]
+
+    inference = {r["inference"] for r in results}
+    assert {"scan", "skipped"} <= inference
+    for result in results:
+        _check_schema(result)
+        assert result["closure_event"] is None
@@ -0,0 +1,32 @@
+"""Time-to-threshold predictions only for real trends"""
+
+import random
+
+from fatigue_trend import FatigueTrend, StreamingTrend
+
+
+def test_flat_series_has_no_prediction():
+    trend = StreamingTrend()
+    for i in range(3000):
+        trend.update(1000.0 + i / 30.0, 15.0)
+    assert trend.seconds_until(10.0, rising=False) is None
+    assert trend.seconds_until(20.0) is None
+
+
+def test_noisy_flat_series_has_no_prediction():
+    rng = random.Random(3)
+    trend = FatigueTrend()
+    for i in range(18000):
+        result = trend.update(1000.0 + i / 30.0, 0.05 + rng.uniform(-0.01, 0.01),
+                              15 + rng.choice((-1, 0, 1)))
+        assert result["seconds_to_high"] is None
+        assert result["seconds_to_low_blink_rate"] is None
+
+
+def test_rising_perclos_is_predicted():
+    trend = FatigueTrend()
+    for i in range(3600):
+        t = i / 30.0
+        result = trend.update(1000.0 + t, 0.05 + 0.001 * t, 15)
+    assert result["seconds_to_high"] is not None
+    assert 0 < result["seconds_to_high"] < trend.horizon_seconds
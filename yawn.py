@@ -0,0 +1,110 @@
+"""
+VigilDrive AI - Yawn Detection
+Counts yawns from the lower part of the face box the detector already found
+
+No extra cascade runs: the mouth region is cut from the face box, shrunk to
+a fixed small size and checked a few times per second, so the cost is a few
+microseconds per check regardless of camera resolution. An open mouth shows
+up as a dark cavity; the dark share is compared with a running baseline for
+this driver, so beards and shadows do not read as yawns. Landmark backends
+supply a mouth aspect ratio (MAR) instead, which is used when fresh.
+"""
+
+import time
+
+import cv2
+
+
+class YawnDetector:
+    """Counts sustained mouth openings in the lower-face ROI"""
+
+    def __init__(self, interval_seconds=0.2, roi_size=(48, 32), open_delta=0.12,
+                 mar_threshold=0.6, min_duration=1.5, baseline_weight=0.05):
+        """
+        Args:
+            interval_seconds: Time between checks (eye analysis runs every frame)
+            roi_size: (width, height) the mouth region is resized to
+            open_delta: Rise of the dark share above baseline that means "open"
+            mar_threshold: MAR above which the mouth is open (landmark backends)
+            min_duration: Seconds the mouth must stay open to count as a yawn
+            baseline_weight: EWMA weight for the closed-mouth dark share
+        """
+        self.interval_seconds = interval_seconds
+        self.roi_size = roi_size
+        self.open_delta = open_delta
+        self.mar_threshold = mar_threshold
+        self.min_duration = min_duration
+        self.baseline_weight = baseline_weight
+
+        self.yawn_count = 0
+        self.baseline = None
+        self.open_since = None
+        self.counted = False
+        self.last_check = None
+
+        self.checks = 0
+        self.total_seconds = 0.0
+
+    def _dark_share(self, gray, face_box):
+        x, y, w, h = face_box
+        roi = gray[y + int(h * 0.65):y + h, x + w // 4:x + 3 * w // 4]
+        if roi.size == 0:
+            return None
+        small = cv2.resize(roi, self.roi_size, interpolation=cv2.INTER_AREA)
+        _, dark = cv2.threshold(small, 0.45 * cv2.mean(small)[0], 255, cv2.THRESH_BINARY_INV)
+        return cv2.countNonZero(dark) / dark.size
+
+    def _is_open(self, gray, face_box, mar):
+        if mar is not None:
+            return mar > self.mar_threshold
+
+        share = self._dark_share(gray, face_box)
+        if share is None:
+            return False
+        if self.baseline is None:
+            self.baseline = share
+        mouth_open = share - self.baseline > self.open_delta
+        if not mouth_open:
+            self.baseline += self.baseline_weight * (share - self.baseline)
+        return mouth_open
+
+    def update(self, gray, face_box, now, mar=None):
+        """
+        Check the mouth if a check is due
+
+        Args:
+            gray: Grayscale frame
+            face_box: (x, y, w, h) of the face being analysed
+            now: Frame time in seconds
+            mar: Fresh mouth aspect ratio for this frame, if the backend has one
+
+        Returns:
+            float: Milliseconds spent (0.0 when no check was due)
+        """
+        if self.last_check is not None and now - self.last_check < self.interval_seconds:
+            return 0.0
+        self.last_check = now
+
+        start = time.perf_counter()
+        if self._is_open(gray, face_box, mar):
+            if self.open_since is None:
+                self.open_since = now
+            if not self.counted and now - self.open_since >= self.min_duration:
+                self.yawn_count += 1
+                self.counted = True
+        else:
+            self.open_since = None
+            self.counted = False
+        elapsed = time.perf_counter() - start
+
+        self.checks += 1
+        self.total_seconds += elapsed
+        return elapsed * 1000
+
+    def stats(self):
+        return {
+            "yawns": self.yawn_count,
+            "checks": self.checks,
+            "mean_check_ms": round(self.total_seconds * 1000 / self.checks, 4) if self.checks else 0.0,
+            "total_ms": round(self.total_seconds * 1000, 2),
+        }